@@ -4,6 +4,12 @@ import copy
 import os
 import random
 import time
+from engine import movegen, search
+from engine.bitboard import QUEEN, WN, WB, WK, BN, BB, BK, popcount
+from engine.move import encode_move, move_promotion, move_name, EN_PASSANT, CASTLING
+from engine.evaluate import evaluate, material_count
+from engine.position import Position, ZOBRIST_SIDE
+from engine.timeman import TimeManager
 #===========================================================================INTIALIZING PYGAME===========================================================================
 pygame.init()
 pygame.mixer.init()
@@ -81,168 +87,26 @@ game_state_history = []  # List of (captured_pieces, en_passant_target, piece_mo
 current_move_index = -1  # -1 = live game, >= 0 = replaying a past move
 replay_animations = []  # List of (from_pos, to_pos, piece, start_time) for animated replay moves
 #===========================================================================TIME CONTROL===========================================================================
+TIME_CONTROLS = {'5min': 300, '10min': 600}  # Starting seconds on each clock
+# AI strength tiers: node budget, time cap (seconds) and random root-move bonus (centipawns).
+# The caps bound every reply whatever the position (measured p50/p99 latencies: see README)
+DIFFICULTY_LEVELS = {
+    'easy': {'nodes': 2000, 'time': 0.5, 'noise': 150},
+    'medium': {'nodes': 20000, 'time': 1.5, 'noise': 40},
+    'hard': {'nodes': 200000, 'time': 5.0, 'noise': 0},
+}
+difficulty = 'hard'
 time_control = None
 white_time_remaining = 0
 black_time_remaining = 0
 last_time_update = None
 time_exceeded = None
-# Search control globals for iterative deepening / time-limited search
-search_start_time = None
-search_time_limit = None
-#===========================================================================ZOBRIST HASHING & MOVE HEURISTICS===========================================================================
-# Zobrist hashing: random 64-bit numbers for piece-square, castling, en-passant and side-to-move.
-ZOBRIST_PIECE = {}  # mapping piece_symbol -> list[64] of random ints
-ZOBRIST_CASTLING = [0] * 6
-ZOBRIST_EP = [0] * 8  # per file
-ZOBRIST_SIDE = 0
-
-# Current incremental Zobrist hash for the live board (keeps TT keys O(1) on make/undo)
+#===========================================================================ZOBRIST HASHING===========================================================================
+# Engine Zobrist hash of the live position (pieces, side to move, castling and en passant).
+# Updated from the engine position after every move; keys the repetition table below.
 current_zobrist = None
-
-# History and killer heuristics
-history_score = {}  # move tuple -> score (improves move ordering over time)
-killer_moves = {}   # depth -> [killer1, killer2]
-
-# Principal variation table for PV extraction
-pv_table = {}
-
-def init_zobrist(seed=0):
-    """Initialize Zobrist random numbers.
-    Quick comment: Zobrist gives an O(1) incremental hash for positions instead of building tuples.
-    """
-    global ZOBRIST_PIECE, ZOBRIST_CASTLING, ZOBRIST_EP, ZOBRIST_SIDE
-    rnd = random.Random(seed)
-    pieces = ['P','N','B','R','Q','K','p','n','b','r','q','k']
-    for p in pieces:
-        ZOBRIST_PIECE[p] = [rnd.getrandbits(64) for _ in range(64)]
-    for i in range(6):
-        ZOBRIST_CASTLING[i] = rnd.getrandbits(64)
-    for i in range(8):
-        ZOBRIST_EP[i] = rnd.getrandbits(64)
-    ZOBRIST_SIDE = rnd.getrandbits(64)
-
-def zobrist_hash(side=None):
-    """Compute Zobrist hash for current board and given side-to-move (or current_turn).
-    This is faster and compact compared to large tuple keys.
-    """
-    h = 0
-    for r in range(8):
-        for c in range(8):
-            p = board[r][c]
-            if p != '.':
-                idx = r * 8 + c
-                h ^= ZOBRIST_PIECE[p][idx]
-
-    # Castling rights (6 booleans in piece_moved)
-    flags = [
-        piece_moved.get('white_king'),
-        piece_moved.get('white_rook_a'),
-        piece_moved.get('white_rook_h'),
-        piece_moved.get('black_king'),
-        piece_moved.get('black_rook_a'),
-        piece_moved.get('black_rook_h')
-    ]
-    for i, f in enumerate(flags):
-        if f:
-            h ^= ZOBRIST_CASTLING[i]
-
-    # En-passant file
-    if en_passant_target is not None:
-        _, ep_col = en_passant_target
-        h ^= ZOBRIST_EP[ep_col]
-
-    # Side to move
-    side_to_move = current_turn if side is None else side
-    if side_to_move == 'black':
-        h ^= ZOBRIST_SIDE
-
-    return h
-
-def square_index(row, col):
-    return row * 8 + col
-
-def apply_zobrist_move(from_sq, to_sq, piece, captured_piece=None, capture_sq=None):
-    """Apply XOR changes to `current_zobrist` for a simple move (non-castling, non-promotion).
-
-    - `from_sq`, `to_sq`: (r,c)
-    - `piece`: moving piece symbol (e.g., 'P' or 'n')
-    - `captured_piece`: captured piece symbol if any
-    - `capture_sq`: (r,c) where captured piece is located (used for en-passant)
-    This function toggles side-to-move as well.
-    """
-    global current_zobrist
-    if current_zobrist is None:
-        # Fallback: compute full hash
-        current_zobrist = zobrist_hash()
-
-    fr, fc = from_sq
-    tr, tc = to_sq
-    fidx = square_index(fr, fc)
-    tidx = square_index(tr, tc)
-
-    # XOR out piece from source
-    if piece is not None and piece != '.':
-        current_zobrist ^= ZOBRIST_PIECE[piece][fidx]
-
-    # XOR out captured piece at its square (if capture_sq given use that, else use target square)
-    if captured_piece and captured_piece != '.':
-        if capture_sq:
-            cidx = square_index(capture_sq[0], capture_sq[1])
-        else:
-            cidx = tidx
-        current_zobrist ^= ZOBRIST_PIECE[captured_piece][cidx]
-
-    # XOR in piece at target
-    if piece is not None and piece != '.':
-        current_zobrist ^= ZOBRIST_PIECE[piece][tidx]
-
-    # Toggle side to move
-    current_zobrist ^= ZOBRIST_SIDE
-
-def init_current_zobrist():
-    global current_zobrist
-    current_zobrist = zobrist_hash()
-
-def get_principal_variation(max_len=20):
-    """Extract PV from `pv_table` starting at current position.
-
-    PV extraction: follow stored best moves from transposition/PV table to build principal variation.
-    """
-    pv = []
-    seen = set()
-    side = current_turn
-    key = position_hash(side)
-    while len(pv) < max_len and key in pv_table and pv_table[key] is not None:
-        mv = pv_table[key]
-        if mv in seen:
-            break
-        pv.append(mv)
-        seen.add(mv)
-        # make the move on a temporary simulation to advance key
-        (from_sq, to_sq) = mv
-        fr, fc = from_sq
-        tr, tc = to_sq
-        piece = board[fr][fc]
-        captured = board[tr][tc]
-        # apply incremental Zobrist for the simulated move
-        try:
-            apply_zobrist_move((fr, fc), (tr, tc), piece, captured)
-        except Exception:
-            pass
-        board[tr][tc] = piece
-        board[fr][fc] = '.'
-        # advance side
-        side = 'black' if side == 'white' else 'white'
-        key = position_hash(side)
-        # undo
-        board[fr][fc] = piece
-        board[tr][tc] = captured
-        try:
-            apply_zobrist_move((fr, fc), (tr, tc), piece, captured)
-        except Exception:
-            pass
-
-    return pv
+# Engine position mirroring `board` and the game-state globals (its piece sets replace board scans)
+live_position = None
 
 #===========================================================================DRAW DETECTION===========================================================================
 # Position repetition tracking and 50-move rule
@@ -268,7 +132,6 @@ animating_move = None
 animation_duration = 0.4  # Faster, snappier animations
 evaluation_history = []  
 current_evaluation = 0 
-transposition_table = {}
 # Cache for legal moves to avoid recalculating
 _legal_moves_cache = {}
 _cache_board_hash = None
@@ -279,6 +142,7 @@ replay_button_rects = {}  # Maps button_name -> pygame.Rect for control buttons
 piece_scale_animation = None  # For piece selection scaling
 hover_square = None  # For hover effects
 game_mode = None  # 'ai' or 'two_player'
+ai_line = []  # The line the AI expects after its last move (principal variation, coordinate notation)
 """===========================================================================DRAW BOARD==========================================================================="""
 def draw_board():
     for row in range(8):
@@ -641,7 +505,8 @@ def jump_to_move(move_index):
     current_turn = 'black' if (move_index % 2) == 0 else 'white'
     
     # Recalculate current_zobrist for the restored state
-    current_zobrist = zobrist_hash()
+    sync_live_position()
+    current_zobrist = live_position.hash
     
     # Generate animations for pieces that moved
     replay_animations = []
@@ -915,6 +780,11 @@ def draw_game_info_panel():
     move_surface = tiny_font.render(move_count_text, True, (180, 180, 180))
     screen.blit(move_surface, (info_x + 10, info_y + 95))
 
+    # The AI's expected continuation (first moves of its principal variation)
+    if game_mode == 'ai' and ai_line:
+        line_surface = tiny_font.render("AI line: " + " ".join(ai_line[:4]), True, (150, 170, 200))
+        screen.blit(line_surface, (info_x + 10, info_y + 112))
+
     button_x = info_x
     button_y = info_y + 70
     button_width = 100
@@ -939,8 +809,8 @@ def draw_right_panel():
     # Add a subtle border/separator
     pygame.draw.line(screen, Panel_border, (board_width, 0), (board_width, height), 3)
     
-    # Draw clocks first (only in two-player mode), then other components laid out beneath
-    if game_mode == 'two_player':
+    # Draw clocks first (when the game has them), then other components laid out beneath
+    if clocks_enabled():
         draw_clocks()
     draw_move_history()
     draw_captured_pieces_panel()
@@ -967,18 +837,7 @@ def draw_ai_thinking_overlay():
 """===========================================================================COUNT MATERIAL==========================================================================="""
 def count_material(color):
     """Count material value for a color."""
-    values = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9}
-    total = 0
-    
-    for row in board:
-        for piece in row:
-            if piece == '.':
-                continue
-            piece_color = 'white' if piece.isupper() else 'black'
-            if piece_color == color:
-                total += values.get(piece.upper(), 0)
-    
-    return total
+    return material_count(live_position, color_index(color))
 """===========================================================================GET PIECE NAME==========================================================================="""
 def get_piece_name(piece):
     
@@ -989,25 +848,9 @@ def get_piece_name(piece):
         'b': 'Bishop', 'n': 'Knight', 'p': 'Pawn'
     }
     return names.get(piece, '')
-"""===========================================================================GET POSITION KEY==========================================================================="""
-def get_position_key():
-    """Create a hashable key describing the current position for repetition detection."""
-    # Use board rows, current turn, castling rights (from piece_moved), and en_passant_target
-    board_tuple = tuple(''.join(row) for row in board)
-    castling = (
-        piece_moved.get('white_king'),
-        piece_moved.get('white_rook_a'),
-        piece_moved.get('white_rook_h'),
-        piece_moved.get('black_king'),
-        piece_moved.get('black_rook_a'),
-        piece_moved.get('black_rook_h')
-    )
-    ep = en_passant_target if en_passant_target is None else (en_passant_target[0], en_passant_target[1])
-    return (board_tuple, current_turn, castling, ep)
 """===========================================================================THREEFOLD REPETITION==========================================================================="""
 def is_threefold_repetition():
-    key = get_position_key()
-    return position_history.get(key, 0) >= 3
+    return position_history.get(current_zobrist, 0) >= 3
 """===========================================================================FIFTY MOVE RULE==========================================================================="""
 def is_fifty_move_rule():
     return halfmove_clock >= 100  # 100 halfmoves = 50 full moves
@@ -1016,56 +859,24 @@ def is_insufficient_material():
     """Basic insufficient material detection.
     Covers: K vs K, K+N vs K, K+B vs K, and K+B vs K+B when bishops on same color is not handled precisely here.
     """
-    pieces = []
-    for r in board:
-        for p in r:
-            if p != '.' and p.upper() != 'K':
-                pieces.append(p)
+    pieces = live_position.pieces
+    others = live_position.all_occupied & ~(pieces[WK] | pieces[BK])
 
     # No pieces except kings
-    if not pieces:
+    if not others:
         return True
 
     # Single minor piece only
-    if len(pieces) == 1 and pieces[0].upper() in ('B', 'N'):
+    if popcount(others) == 1 and others & (pieces[WN] | pieces[WB] | pieces[BN] | pieces[BB]):
         return True
 
     # More advanced cases (both sides only bishops) could be added later
     return False
-"""===========================================================================IS IN CHECK==========================================================================="""
-def is_in_check(color):
-    king_pos = find_king(color)
-    if not king_pos:
-        return False
-    opponent = 'black' if color == 'white' else 'white'
-    # Generate all opponent moves and see if any attack king
-    for r in range(8):
-        for c in range(8):
-            p = board[r][c]
-            if p == '.':
-                continue
-            if opponent == 'white' and not p.isupper():
-                continue
-            if opponent == 'black' and not p.islower():
-                continue
-            moves = get_piece_moves(r, c)
-            if king_pos in moves:
-                return True
-    return False
 """===========================================================================IS STALEMATE==========================================================================="""
 def is_stalemate():
     # No legal moves for current player and not in check
-    for r in range(8):
-        for c in range(8):
-            p = board[r][c]
-            if p == '.':
-                continue
-            if current_turn == 'white' and not p.isupper():
-                continue
-            if current_turn == 'black' and not p.islower():
-                continue
-            if get_valid_moves(r, c):
-                return False
+    if get_all_legal_moves(current_turn):
+        return False
     return not is_in_check(current_turn)
 """===========================================================================CHECK DRAW CONDITIONS==========================================================================="""
 def check_draw_conditions():
@@ -1109,104 +920,56 @@ def is_current_player_piece(piece):
         return is_white_piece(piece)
     else:
         return is_black_piece(piece)
-"""===========================================================================ENEMY PIECE==========================================================================="""
-def is_enemy_piece(piece , player_color):
-    if player_color == "white":
-        return is_black_piece(piece)
-    else:
-        return is_white_piece(piece)
 """===========================================================================MOVE PIECE==========================================================================="""
 def move_piece(from_square , to_square):
-    global en_passant_target , promotion_pending, _legal_moves_cache, transposition_table, halfmove_clock, position_history, current_zobrist
-    global white_in_check_cached, black_in_check_cached
+    global board, en_passant_target , promotion_pending, _legal_moves_cache, halfmove_clock, position_history, current_zobrist
+    global white_in_check_cached, black_in_check_cached, live_position
 
     from_row,from_col = from_square
     to_row,to_col = to_square
     start_animation(from_square , to_square)
 
     piece = board[from_row][from_col]
-    captured_piece = board[to_row][to_col]
-    # Save previous Zobrist-affecting state
-    prev_en_passant = en_passant_target
-    prev_piece_moved = piece_moved.copy()
+    is_castling = piece.upper() == 'K' and abs(to_col - from_col) == 2
+    is_en_passant = piece.upper() == 'P' and to_col != from_col and board[to_row][to_col] == '.'
+    is_promotion = piece.upper() == 'P' and to_row in (0, 7)
+    captured_piece = board[from_row][to_col] if is_en_passant else board[to_row][to_col]
+
+    # Play the move on the engine position: it moves the castling rook, removes the en-passant
+    # pawn, promotes (to a queen until promote_pawn applies the player's choice) and updates the hash
+    pos = current_position()
+    flag = CASTLING if is_castling else EN_PASSANT if is_en_passant else 0
+    move = encode_move(from_row * 8 + from_col, to_row * 8 + to_col, QUEEN if is_promotion else 0, flag)
+    checks = movegen.gives_check(pos, move)
+    pos.make_move(move)
 
     while update_animation():
         draw_board()
         draw_pieces()
         pygame.display.flip()
         clock.tick(60)
-    
-    if piece.upper() == 'K' and abs(to_col - from_col) == 2:
-        execute_castling(from_row, from_col, to_col)
-        update_pieces_moved(piece, from_row, from_col)
+
+    board = pos.to_board()
+    live_position = pos
+    if is_castling:
         play_sound('castle', volume=0.6)
-        _legal_moves_cache.clear()
-        transposition_table.clear()
-        return True
-    
-    is_en_passant = False
-    if piece.upper() == 'P' and to_col != from_col and board[to_row][to_col] == '.':
-        is_en_passant = True
-        captured_actual = board[from_row][to_col]
-        capture_sq = (from_row, to_col)
-    else:
-        captured_actual = board[to_row][to_col]
-        capture_sq = (to_row, to_col)
-
-    # Update incremental Zobrist for this move (handles piece squares, captures, and side)
-    try:
-        apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured_actual, capture_sq)
-    except Exception:
-        # if for any reason incremental hash isn't available, fall back later
-        pass
-
-    if is_en_passant:
-        board[to_row][to_col] = piece
-        board[from_row][from_col] = '.'
-        board[from_row][to_col] = '.'  
+    elif is_en_passant:
         play_sound('pawn_capture', volume=0.6)
+    elif captured_piece != '.':
+        play_capture_sound(captured_piece, piece)
     else:
-        board[to_row][to_col] = piece
-        board[from_row][from_col] = '.'
-        if captured_piece != '.':
-            play_capture_sound(captured_piece, piece)  # ← ADD THIS
-        else:
-            play_move_sound(piece)
-    
+        play_move_sound(piece)
+
     update_pieces_moved(piece , from_row , from_col)
+    if captured_piece.upper() == 'R':
+        update_pieces_moved(captured_piece, to_row, to_col)  # A rook taken on its home square loses its castling right
+    en_passant_target = divmod(pos.ep_square, 8) if pos.ep_square != -1 else None
+    halfmove_clock = pos.halfmove_clock
+    current_zobrist = pos.hash
     _legal_moves_cache.clear()
-    transposition_table.clear()
 
-    # Update en-passant target and XOR EP changes into incremental hash
-    en_passant_target = None
-    if piece.upper() == 'P' and abs(to_row - from_row) == 2:
-        ep_row = (from_row + to_row) // 2
-        en_passant_target = (ep_row, to_col)
-
-    # Apply en-passant Zobrist changes (old -> new)
-    if current_zobrist is not None:
-        # XOR out previous EP
-        if prev_en_passant is not None:
-            _, prev_col = prev_en_passant
-            current_zobrist ^= ZOBRIST_EP[prev_col]
-        # XOR in new EP
-        if en_passant_target is not None:
-            _, new_col = en_passant_target
-            current_zobrist ^= ZOBRIST_EP[new_col]
-
-    # Update castling-related Zobrist bits for any flags that changed from False->True
-    if current_zobrist is not None:
-        flag_keys = [
-            'white_king', 'white_rook_a', 'white_rook_h',
-            'black_king', 'black_rook_a', 'black_rook_h'
-        ]
-        for i, key in enumerate(flag_keys):
-            if not prev_piece_moved.get(key, False) and piece_moved.get(key, False):
-                current_zobrist ^= ZOBRIST_CASTLING[i]
-    
-    if piece.upper() == 'P':
-        if (piece == 'P' and to_row == 0) or (piece == 'p' and to_row == 7):
-            promotion_pending = (to_row, to_col)
+    if is_promotion:
+        promotion_pending = (to_row, to_col)
 
     from_notation = f"{Files[from_col]}{8 - from_row}"
     to_notation = f"{Files[to_col]}{8 - to_row}"
@@ -1220,7 +983,9 @@ def move_piece(from_square , to_square):
         print(f"Capture! {get_piece_name(piece)} takes {get_piece_name(captured_piece)}")
     else:
         move_str  = f"{from_notation} → {to_notation}"
-    
+    if checks:
+        move_str += "+"
+
     move_history.append(move_str)
     print(f"Move: {move_str}")
     current_evaluation = evaluate_board() / 100  # Convert to pawn units
@@ -1237,26 +1002,8 @@ def move_piece(from_square , to_square):
     })
     current_move_index = len(board_history) - 1  # Set to latest move (live game)
 
-    # Update halfmove clock: reset on pawn move or capture
-    if piece.upper() == 'P' or capture_happened:
-        halfmove_clock = 0
-    else:
-        halfmove_clock += 1
-
-    # Record current position after move for repetition detection (key uses side to move after this move)
-    next_turn = 'black' if current_turn == 'white' else 'white'
-    board_tuple = tuple(''.join(row) for row in board)
-    castling = (
-        piece_moved.get('white_king'),
-        piece_moved.get('white_rook_a'),
-        piece_moved.get('white_rook_h'),
-        piece_moved.get('black_king'),
-        piece_moved.get('black_rook_a'),
-        piece_moved.get('black_rook_h')
-    )
-    ep = en_passant_target if en_passant_target is None else (en_passant_target[0], en_passant_target[1])
-    key = (board_tuple, next_turn, castling, ep)
-    position_history[key] = position_history.get(key, 0) + 1
+    # Record the position after the move (its hash includes the side to move next) for repetition detection
+    position_history[current_zobrist] = position_history.get(current_zobrist, 0) + 1
 
     # Check draw conditions (threefold, 50-move, insufficient material, stalemate)
     check_draw_conditions()
@@ -1269,251 +1016,25 @@ def move_piece(from_square , to_square):
     evaluation_history.append(current_evaluation)
 
     return True
-"""===========================================================================PIECE IS ON BOARD==========================================================================="""
-def is_on_board(row , col):
-    return 0 <= row < 8 and 0 <= col < 8
-"""===========================================================================FIND KING==========================================================================="""
-def find_king(color):
-    target_king = 'K' if color == 'white' else 'k'
-    
-    for row in range(8):
-        for col in range(8):
-            if board[row][col] == target_king:
-                return (row, col)
-    
-    return None
-"""===================================================================================================================================================================="""
-#===========================================================================GET PIECE MOVES===========================================================================
-def get_piece_moves(row , col):
-    piece = board[row][col]
-    if piece == '.':
-        return[]
-    piece_type = piece.upper()
-    if piece_type == 'P':
-        return get_pawn_moves(row , col , piece)
-    elif piece_type == 'R':
-        return get_rook_moves(row , col , piece)
-    elif piece_type == 'N':
-        return get_knight_moves(row , col , piece)
-    elif piece_type == 'B':
-        return get_bishop_moves(row , col , piece)
-    elif piece_type == 'Q':
-        return get_queen_moves(row , col , piece)
-    elif piece_type == 'K':
-        return get_king_moves(row , col , piece)
-    return[]
-#===========================================================================PAWN MOVES===========================================================================
-def get_pawn_moves(row , col , piece):
-    moves = []
-    
-    if piece.isupper():
-        direction = -1
-        start_row = 6 
-        en_passant_row = 3 
-    else:  
-        direction = 1
-        start_row = 1 
-        en_passant_row = 4 
-    
-    new_row = row + direction
-    if is_on_board(new_row, col):
-        if board[new_row][col] == '.':
-            moves.append((new_row, col))
-            
-            if row == start_row:
-                new_row_2 = row + (2 * direction)
-                if board[new_row_2][col] == '.':
-                    moves.append((new_row_2, col))
-
-    player_color = 'white' if piece.isupper() else 'black'
-    for col_offset in [-1, 1]:  
-        new_row = row + direction
-        new_col = col + col_offset
-        
-        if is_on_board(new_row, new_col):
-            target = board[new_row][new_col]
-            if target != '.' and is_enemy_piece(target, player_color):
-                moves.append((new_row, new_col))
-    
-    if row == en_passant_row and en_passant_target:
-        ep_row , ep_col = en_passant_target
-        if abs(ep_col - col) == 1 and ep_row == row + direction:
-            moves.append((ep_row , ep_col))
-    
-    return moves
-#===========================================================================ROOK MOVES===========================================================================
-def get_rook_moves(row , col , piece):
-    moves = []
-    player_color = 'white' if piece.isupper() else 'black'
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
-    for d_row, d_col in directions:
-        current_row = row + d_row
-        current_col = col + d_col
-        
-        while is_on_board(current_row, current_col):
-            target = board[current_row][current_col]
-            
-            if target == '.':
-                moves.append((current_row, current_col))
-            elif is_enemy_piece(target, player_color):
-                moves.append((current_row, current_col))
-                break 
-            else:
-                break
-            
-            current_row += d_row
-            current_col += d_col
-    
-    return moves
-#===========================================================================KNIGHT MOVES===========================================================================
-def get_knight_moves(row , col , piece):
-    moves = []
-    player_color = 'white' if piece.isupper() else 'black'
-    knight_moves = [
-        (-2, -1), (-2, 1),   
-        (-1, -2), (-1, 2),   
-        (1, -2),  (1, 2),    
-        (2, -1),  (2, 1)     
-    ]
-    
-    for d_row, d_col in knight_moves:
-        new_row = row + d_row
-        new_col = col + d_col
-        
-        if is_on_board(new_row, new_col):
-            target = board[new_row][new_col]
-            
-            if target == '.' or is_enemy_piece(target, player_color):
-                moves.append((new_row, new_col))
-    
-    return moves
-#===========================================================================BHISHOP MOVES===========================================================================
-def get_bishop_moves(row , col , piece):
-    moves = []
-    player_color = 'white' if piece.isupper() else 'black'
-    directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-    
-    for d_row, d_col in directions:
-        current_row = row + d_row
-        current_col = col + d_col
-        
-        while is_on_board(current_row, current_col):
-            target = board[current_row][current_col]
-            
-            if target == '.':
-                moves.append((current_row, current_col))
-            elif is_enemy_piece(target, player_color):
-                moves.append((current_row, current_col))
-                break
-            else:
-                break
-            
-            current_row += d_row
-            current_col += d_col
-    
-    return moves
-#===========================================================================QUEEN MOVES===========================================================================
-def get_queen_moves(row , col , piece):
-    moves = []
-    
-    moves.extend(get_rook_moves(row, col, piece))
-    moves.extend(get_bishop_moves(row, col, piece))
-    
-    return moves
-#===========================================================================KING MOVES===========================================================================
-def get_king_moves(row , col , piece, include_castling=True):
-    moves = []
-    player_color = 'white' if piece.isupper() else 'black'
-    directions = [
-        (-1, -1), (-1, 0), (-1, 1),
-        (0, -1),           (0, 1),
-        (1, -1),  (1, 0),  (1, 1)
-    ]
-    
-    for d_row, d_col in directions:
-        new_row = row + d_row
-        new_col = col + d_col
-        
-        if is_on_board(new_row, new_col):
-            target = board[new_row][new_col]
-            
-            if target == '.' or is_enemy_piece(target, player_color):
-                moves.append((new_row, new_col))
-    if include_castling:
-        if can_castle_kingside(player_color):
-            moves.append((row , 6))
-        if can_castle_queenside(player_color):
-            moves.append((row , 2))
-    return moves
-#===========================================================================CASTLE KINGSIDE===========================================================================
-def can_castle_kingside(color):
-    if color == 'white':
-        king_row, king_col = 7, 4
-        rook_col = 7
-        if piece_moved['white_king'] or piece_moved['white_rook_h']:
-            return False
-    else:
-        king_row, king_col = 0, 4
-        rook_col = 7
-        if piece_moved['black_king'] or piece_moved['black_rook_h']:
-            return False
-    
-    for col in range(king_col + 1, rook_col):
-        if board[king_row][col] != '.':
-            return False
-    
-    if is_in_check(color):
-        return False
-    
-    enemy_color = 'black' if color == 'white' else 'white'
-    for col in [king_col + 1, king_col + 2]:
-        if is_square_attacked(king_row, col, enemy_color):
-            return False
-    
-    return True
-#===========================================================================CASTLE QUEENSIDE===========================================================================
-def can_castle_queenside(color):
-    if color == 'white':
-        king_row, king_col = 7, 4
-        rook_col = 0
-        if piece_moved['white_king'] or piece_moved['white_rook_a']:
-            return False
-    else:
-        king_row, king_col = 0, 4
-        rook_col = 0
-        if piece_moved['black_king'] or piece_moved['black_rook_a']:
-            return False
-    
-    for col in range(rook_col + 1, king_col):
-        if board[king_row][col] != '.':
-            return False
-    
-    if is_in_check(color):
-        return False
-    
-    enemy_color = 'black' if color == 'white' else 'white'
-    for col in [king_col - 1, king_col - 2]:
-        if is_square_attacked(king_row, col, enemy_color):
-            return False
-    
-    return True
-#===========================================================================EXECUTE CASATLING===========================================================================
-def execute_castling(king_row, king_col, target_col):
-    if target_col == 6:  # Kingside
-        board[king_row][6] = board[king_row][4]  # Move king
-        board[king_row][5] = board[king_row][7]  # Move rook
-        board[king_row][4] = '.'
-        board[king_row][7] = '.'
-    else:  # Queenside 
-        board[king_row][2] = board[king_row][4]  # Move king
-        board[king_row][3] = board[king_row][0]  # Move rook
-        board[king_row][4] = '.'
-        board[king_row][0] = '.'
 #===========================================================================PROMOTE PAWN===========================================================================
 def promote_pawn(row , col , piece_type):
+    global current_zobrist
     is_white = board[row][col].isupper()
     board[row][col] = piece_type.upper() if is_white else piece_type.lower()
+    if board_history:
+        board_history[-1][row][col] = board[row][col]
+
+    # move_piece recorded the position with a queen; re-key it if the player under-promoted
+    sync_live_position()
+    if move_history:
+        # The check suffix was worked out for a queen
+        checks = is_in_check('black' if is_white else 'white')
+        move_history[-1] = move_history[-1].rstrip('+') + ('+' if checks else '')
+    new_key = current_position('black' if is_white else 'white').hash
+    if new_key != current_zobrist:
+        position_history[current_zobrist] -= 1
+        position_history[new_key] = position_history.get(new_key, 0) + 1
+        current_zobrist = new_key
 """===================================================================================================================================================================="""
 """===========================================================================UPDATE PIECES MOVED==========================================================================="""
 def update_pieces_moved(piece , from_row , from_col):
@@ -1531,146 +1052,63 @@ def update_pieces_moved(piece , from_row , from_col):
             piece_moved['black_rook_a'] = True
         elif from_row == 0 and from_col == 7:
             piece_moved['black_rook_h'] = True
+"""===========================================================================CURRENT POSITION==========================================================================="""
+def sync_live_position():
+    """Rebuild `live_position` after `board` or the game-state globals were set directly (reset, replay, promotion)."""
+    global live_position
+    live_position = Position.from_board(board, current_turn, piece_moved, en_passant_target, halfmove_clock)
+
+def current_position(side=None):
+    """Copy of the live position for the engine to search (side defaults to `current_turn`)."""
+    pos = live_position.copy()
+    side = color_index(side or current_turn)
+    if pos.side != side:
+        pos.side = side
+        pos.hash ^= ZOBRIST_SIDE
+    return pos
+
+def color_index(color):
+    return 0 if color == 'white' else 1
+
+def to_ui_move(move):
+    """Engine move (packed int) -> ((from_row, from_col), (to_row, to_col), promotion piece letter or None)."""
+    promotion = move_promotion(move)
+    return divmod(move & 63, 8), divmod(move >> 6 & 63, 8), ('.NBRQ'[promotion] if promotion else None)
 """===========================================================================IS SQUARE ATTACKED==========================================================================="""
 def is_square_attacked(row, col, by_color):
-    """Optimized check if a square is attacked by a color."""
-    # Check pawn attacks (simple early exit)
-    # Pawns attack diagonally in the direction they move
-    # White pawns move up (direction -1), so they attack FROM row+1 (below them)
-    # Black pawns move down (direction +1), so they attack FROM row-1 (above them)
-    if by_color == 'white':
-        pawn_dirs = [(1, -1), (1, 1)]  # Pawns below the target square
-    else:
-        pawn_dirs = [(-1, -1), (-1, 1)]  # Pawns above the target square
-    
-    for d_row, d_col in pawn_dirs:
-        check_row, check_col = row + d_row, col + d_col
-        if is_on_board(check_row, check_col):
-            piece = board[check_row][check_col]
-            if piece.upper() == 'P' and ((piece.isupper() and by_color == 'white') or (piece.islower() and by_color == 'black')):
-                return True
-    
-    # Check knight attacks
-    knight_moves = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-    for d_row, d_col in knight_moves:
-        check_row, check_col = row + d_row, col + d_col
-        if is_on_board(check_row, check_col):
-            piece = board[check_row][check_col]
-            if piece.upper() == 'N' and ((piece.isupper() and by_color == 'white') or (piece.islower() and by_color == 'black')):
-                return True
-    
-    # Check sliding pieces (rooks, bishops, queens)
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-    for d_row, d_col in directions:
-        check_row, check_col = row + d_row, col + d_col
-        while is_on_board(check_row, check_col):
-            piece = board[check_row][check_col]
-            if piece != '.':
-                if (piece.isupper() and by_color == 'white') or (piece.islower() and by_color == 'black'):
-                    piece_type = piece.upper()
-                    if piece_type == 'Q':
-                        return True
-                    elif piece_type == 'R' and (d_row != 0 or d_col != 0) and not (d_row != 0 and d_col != 0):
-                        return True
-                    elif piece_type == 'B' and (d_row != 0 and d_col != 0):
-                        return True
-                break
-            check_row += d_row
-            check_col += d_col
-    
-    # Check king attacks
-    king_moves = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-    for d_row, d_col in king_moves:
-        check_row, check_col = row + d_row, col + d_col
-        if is_on_board(check_row, check_col):
-            piece = board[check_row][check_col]
-            if piece.upper() == 'K' and ((piece.isupper() and by_color == 'white') or (piece.islower() and by_color == 'black')):
-                return True
-    
-    return False
+    return movegen.is_square_attacked(live_position, row * 8 + col, color_index(by_color))
 """===========================================================================IS IN CHECK==========================================================================="""
 def is_in_check(color):
-    king_pos = find_king(color)
-    if king_pos is None:
+    if live_position.king_sq[color_index(color)] == -1:
         return False
-    row , col = king_pos
-    enemy_color = 'black' if color == 'white' else 'white'
-    return is_square_attacked(row , col , enemy_color)
-"""===========================================================================WOULD BE CHECK AFTER MOVE==========================================================================="""
-def would_be_in_check_after_move(from_square , to_square , color):
-    global board
-    
-    from_row, from_col = from_square
-    to_row, to_col = to_square
-    
-    # Save state
-    captured = board[to_row][to_col]
-    piece = board[from_row][from_col]
-    
-    # Make move
-    # Incremental Zobrist update for simulated move
-    try:
-        apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-    except Exception:
-        pass
-    board[to_row][to_col] = piece
-    board[from_row][from_col] = '.'
-    
-    in_check = is_in_check(color)
-    
-    # Undo move
-    board[from_row][from_col] = piece
-    board[to_row][to_col] = captured
-    try:
-        apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-    except Exception:
-        pass
-    
-    return in_check
+    return movegen.in_check(live_position, color_index(color))
 """===========================================================================GET VALID MOVES==========================================================================="""
 def get_valid_moves(row , col):
     piece = board[row][col]
     if piece == '.':
         return []
-    
+
     player_color = 'white' if piece.isupper() else 'black'
-    
-    # Get all possible moves
-    possible_moves = get_piece_moves(row, col)
-    # Filter out moves that would leave king in check
     legal_moves = []
-    for move in possible_moves:
-        # Simulate the move and check if king would be in check
-        if not would_be_in_check_after_move((row, col), move, player_color):
-            legal_moves.append(move)
-    
+    for from_sq, to_sq in get_all_legal_moves(player_color):
+        if from_sq == (row, col) and to_sq not in legal_moves:
+            legal_moves.append(to_sq)
     return legal_moves
 """===========================================================================GET ALL LEGAL MOVES==========================================================================="""
 def get_all_legal_moves(color):
-    global _legal_moves_cache, _cache_board_hash
-    
-    board_hash = position_hash()
-    cache_key = (board_hash, color)
-    
+    pos = current_position(color)
+    cache_key = pos.hash
+
     # Return cached result if board hasn't changed
     if cache_key in _legal_moves_cache:
         return _legal_moves_cache[cache_key]
-    
+
     all_moves = []
-    
-    for row in range(8):
-        for col in range(8):
-            piece = board[row][col]
-            
-            if piece == '.':
-                continue
-            
-            piece_color = 'white' if piece.isupper() else 'black'
-            if piece_color == color:
-                moves = get_valid_moves(row, col)
-                for move in moves:
-                    all_moves.append(((row, col), move))
-    
+    for move in movegen.generate_legal_moves(pos):
+        from_sq, to_sq, _ = to_ui_move(move)
+        if (from_sq, to_sq) not in all_moves:  # promotions share squares
+            all_moves.append((from_sq, to_sq))
+
     _legal_moves_cache[cache_key] = all_moves
     return all_moves
 """===========================================================================CHECK GAME OVER==========================================================================="""
@@ -1735,10 +1173,6 @@ def ease_in_out(t):
 def switch_turn():
     global current_turn
     current_turn = 'black' if current_turn == 'white' else 'white'
-    # Keep incremental Zobrist hash in sync with side-to-move
-    global current_zobrist
-    if current_zobrist is not None:
-        current_zobrist ^= ZOBRIST_SIDE
     if is_in_check(current_turn):
         print(f"Check! {current_turn.capitalize()}'s king is under attack!")
         play_sound('check', volume=0.7)
@@ -1750,848 +1184,75 @@ def switch_turn():
 """===========================================================================EVALUATE BOARD==========================================================================="""
 def evaluate_board(depth=0):
     """
-    Optimized evaluation with depth-dependent features.
-    
+    Evaluate the live board in centipawns (positive = good for White).
+
     depth=0: Root/shallow nodes - full evaluation
-    depth>0: Deep nodes - fast evaluation only
-    
-    This gives 10-20x speedup with minimal strength loss.
+    depth>2: Deep nodes - material + piece-square tables only
     """
-    score = 0
-    piece_values = {'P': 100, 'N': 320, 'B': 330, 'R': 500, 'Q': 900, 'K': 20000}
-    
-    # ============================================
-    # PHASE 1: ALWAYS CALCULATE (Fast & Critical)
-    # ============================================
-    
-    # Material + Position
-    for row in range(8):
-        for col in range(8):
-            piece = board[row][col]
-            
-            if piece == '.':
-                continue
-            
-            piece_type = piece.upper()
-            
-            if piece_type in piece_values:
-                material_value = piece_values[piece_type]
-                positional_value = get_piece_square_value(piece, row, col)
-                total_value = material_value + positional_value
-                
-                if piece.isupper():
-                    score += total_value
-                else:
-                    score -= total_value
-    
-    # ============================================
-    # PHASE 2: ONLY AT SHALLOW DEPTH (Expensive)
-    # ============================================
-    
-    # If we're deep in the search tree, skip expensive evaluations
-    # Depth > 2 means we're 3+ moves deep - just use material+position
-    if depth > 2:
-        return score
-    
-    # Only calculate expensive features near root of search tree
-    
-    # Center control (cheap - always do it)
-    score += evaluate_center_control()
-    
-    # Rook placement (cheap)
-    score += evaluate_rook_on_open_file()
-    
-    # Bishop pair (cheap)
-    white_bishops = sum(1 for r in board for p in r if p == 'B')
-    black_bishops = sum(1 for r in board for p in r if p == 'b')
-    if white_bishops >= 2:
-        score += 30
-    if black_bishops >= 2:
-        score -= 30
-    
-    # Only at root/very shallow (depth 0-1)
-    if depth <= 1:
-        # Pawn structure (medium cost)
-        score += evaluate_pawn_structure()
-        
-        # King safety (medium cost)
-        white_king_safety = evaluate_king_safety('white')
-        black_king_safety = evaluate_king_safety('black')
-        score += white_king_safety - black_king_safety
-    
-    # REMOVED: Mobility - too expensive, depth handles this better
-    
-    return score
-"""===========================================================================PIECE-SQUARE TABLES==========================================================================="""
-# Pawn table - encourage advancement and center control
-PAWN_TABLE = [
-    [0,   0,   0,   0,   0,   0,   0,   0],
-    [50,  50,  50,  50,  50,  50,  50,  50],
-    [10,  10,  20,  30,  30,  20,  10,  10],
-    [5,   5,   10,  25,  25,  10,  5,   5],
-    [0,   0,   0,   20,  20,  0,   0,   0],
-    [5,   -5,  -10, 0,   0,   -10, -5,  5],
-    [5,   10,  10,  -20, -20, 10,  10,  5],
-    [0,   0,   0,   0,   0,   0,   0,   0]
-]
-# Knight table - prefer center, avoid edges
-KNIGHT_TABLE = [
-    [-50, -40, -30, -30, -30, -30, -40, -50],
-    [-40, -20, 0,   0,   0,   0,   -20, -40],
-    [-30, 0,   10,  15,  15,  10,  0,   -30],
-    [-30, 5,   15,  20,  20,  15,  5,   -30],
-    [-30, 0,   15,  20,  20,  15,  0,   -30],
-    [-30, 5,   10,  15,  15,  10,  5,   -30],
-    [-40, -20, 0,   5,   5,   0,   -20, -40],
-    [-50, -40, -30, -30, -30, -30, -40, -50]
-]
-# Bishop table - prefer long diagonals
-BISHOP_TABLE = [
-    [-20, -10, -10, -10, -10, -10, -10, -20],
-    [-10, 0,   0,   0,   0,   0,   0,   -10],
-    [-10, 0,   5,   10,  10,  5,   0,   -10],
-    [-10, 5,   5,   10,  10,  5,   5,   -10],
-    [-10, 0,   10,  10,  10,  10,  0,   -10],
-    [-10, 10,  10,  10,  10,  10,  10,  -10],
-    [-10, 5,   0,   0,   0,   0,   5,   -10],
-    [-20, -10, -10, -10, -10, -10, -10, -20]
-]
-# Rook table - prefer 7th rank and open files
-ROOK_TABLE = [
-    [0,  0,  0,  0,  0,  0,  0,  0],
-    [5,  10, 10, 10, 10, 10, 10, 5],
-    [-5, 0,  0,  0,  0,  0,  0,  -5],
-    [-5, 0,  0,  0,  0,  0,  0,  -5],
-    [-5, 0,  0,  0,  0,  0,  0,  -5],
-    [-5, 0,  0,  0,  0,  0,  0,  -5],
-    [-5, 0,  0,  0,  0,  0,  0,  -5],
-    [0,  0,  0,  5,  5,  0,  0,  0]
-]
-# Queen table - prefer center, avoid early development
-QUEEN_TABLE = [
-    [-20, -10, -10, -5,  -5,  -10, -10, -20],
-    [-10, 0,   0,   0,   0,   0,   0,   -10],
-    [-10, 0,   5,   5,   5,   5,   0,   -10],
-    [-5,  0,   5,   5,   5,   5,   0,   -5],
-    [0,   0,   5,   5,   5,   5,   0,   -5],
-    [-10, 5,   5,   5,   5,   5,   0,   -10],
-    [-10, 0,   5,   0,   0,   0,   0,   -10],
-    [-20, -10, -10, -5,  -5,  -10, -10, -20]
-]
-# King table - stay safe in early/mid game
-KING_MIDDLE_GAME = [
-    [-30, -40, -40, -50, -50, -40, -40, -30],
-    [-30, -40, -40, -50, -50, -40, -40, -30],
-    [-30, -40, -40, -50, -50, -40, -40, -30],
-    [-30, -40, -40, -50, -50, -40, -40, -30],
-    [-20, -30, -30, -40, -40, -30, -30, -20],
-    [-10, -20, -20, -20, -20, -20, -20, -10],
-    [20,  20,  0,   0,   0,   0,   20,  20],
-    [20,  30,  10,  0,   0,   10,  30,  20]
-]
-# King endgame table - be active in center
-KING_END_GAME = [
-    [-50, -40, -30, -20, -20, -30, -40, -50],
-    [-30, -20, -10, 0,   0,   -10, -20, -30],
-    [-30, -10, 20,  30,  30,  20,  -10, -30],
-    [-30, -10, 30,  40,  40,  30,  -10, -30],
-    [-30, -10, 30,  40,  40,  30,  -10, -30],
-    [-30, -10, 20,  30,  30,  20,  -10, -30],
-    [-30, -30, 0,   0,   0,   0,   -30, -30],
-    [-50, -30, -30, -30, -30, -30, -30, -50]
-]
-"""===========================================================================GET PIECE SQUARE VALUE==========================================================================="""
-def get_piece_square_value(piece , row , col):
-    piece_type = piece.upper()
-
-    if piece.islower():
-        row = 7 - row
-    
-    if piece_type == 'P':
-        return PAWN_TABLE[row][col]
-    elif piece_type == 'N':
-        return KNIGHT_TABLE[row][col]
-    elif piece_type == 'B':
-        return BISHOP_TABLE[row][col]
-    elif piece_type == 'R':
-        return ROOK_TABLE[row][col]
-    elif piece_type == 'Q':
-        return QUEEN_TABLE[row][col]
-    elif piece_type == 'K':
-        # Use endgame table if few pieces left
-        total_material = count_material('white') + count_material('black')
-        if total_material < 30:  # Endgame
-            return KING_END_GAME[row][col]
-        else:  # Middle game
-            return KING_MIDDLE_GAME[row][col]
-    return 0
-"""===========================================================================EVALUATE MOBILITY==========================================================================="""
-def evaluate_mobility(color):
-    mobility = 0 
-    for row in range(8):
-        for col in range(8):
-            piece = board[row][col]
-            if piece == '.':
-                continue
-            piece_color = 'white' if piece.isupper() else 'black'
-            if piece_color == color:
-                moves = get_piece_moves(row, col)
-                mobility += len(moves)
-    return mobility
-"""===========================================================================EVALUATE KING SAFETY==========================================================================="""
-def evaluate_king_safety(color):
-    king_pos = find_king(color)
-    if not king_pos:
-        return 0
-    
-    king_row , king_col = king_pos
-    safety = 0
-
-    if color == 'white':
-        shield_row = king_row - 1
-        pawn = 'P'
-    else:
-        shield_row = king_row + 1
-        pawn = 'p'
-    
-    if 0 <= shield_row < 8:
-        for col_offset in [-1, 0, 1]:
-            check_col = king_col + col_offset
-            if 0 <= check_col < 8:
-                if board[shield_row][check_col] == pawn:
-                    safety += 10
-
-    enemy_color = 'black' if color == 'white' else 'white'
-    for row in range(max(0, king_row - 2), min(8, king_row + 3)):
-        for col in range(max(0, king_col - 2), min(8, king_col + 3)):
-            piece = board[row][col]
-            if piece == '.':
-                continue
-            piece_color = 'white' if piece.isupper() else 'black'
-            if piece_color == enemy_color:
-                safety -= 5
-    
-    return safety
-"""===========================================================================EVALUATE PAWN STRUCTURE==========================================================================="""
-def evaluate_pawn_structure(): 
-    score = 0
-    
-    for col in range(8):
-        white_pawns_in_file = 0
-        black_pawns_in_file = 0
-        
-        for row in range(8):
-            if board[row][col] == 'P':
-                white_pawns_in_file += 1
-            elif board[row][col] == 'p':
-                black_pawns_in_file += 1
-        
-        # Penalty for doubled pawns
-        if white_pawns_in_file > 1:
-            score -= 10 * (white_pawns_in_file - 1)
-        if black_pawns_in_file > 1:
-            score += 10 * (black_pawns_in_file - 1)
-    
-    # Check for isolated pawns
-    for col in range(8):
-        for row in range(8):
-            piece = board[row][col]
-            if piece.upper() != 'P':
-                continue
-            
-            # Check if pawn has friendly pawns on adjacent files
-            has_support = False
-            for adj_col in [col - 1, col + 1]:
-                if 0 <= adj_col < 8:
-                    for check_row in range(8):
-                        if board[check_row][adj_col] == piece:
-                            has_support = True
-                            break
-            
-            # Isolated pawn penalty
-            if not has_support:
-                if piece == 'P':
-                    score -= 15
-                else:
-                    score += 15
-    
-    return score
-"""===========================================================================EVALUATE CENTER CONTROL==========================================================================="""
-def evaluate_center_control():
-    center_squares = [(3, 3), (3, 4), (4, 3), (4, 4)]
-    extended_center = [(2, 2), (2, 3), (2, 4), (2, 5),
-                       (3, 2), (3, 5), (4, 2), (4, 5),
-                       (5, 2), (5, 3), (5, 4), (5, 5)]
-    
-    score = 0
-    for row, col in center_squares:
-        piece = board[row][col]
-        if piece != '.':
-            if piece.isupper():
-                score += 10
-            else:
-                score -= 10
-    
-    # Extended center
-    for row, col in extended_center:
-        piece = board[row][col]
-        if piece != '.':
-            if piece.isupper():
-                score += 5
-            else:
-                score -= 5
-    
-    return score
-"""===========================================================================EVALUATE ROOK ON OPEN FILE==========================================================================="""
-def evaluate_rook_on_open_file():
-    score = 0
-    
-    for col in range(8):
-        has_white_pawn = False
-        has_black_pawn = False
-        white_rook = False
-        black_rook = False
-        
-        for row in range(8):
-            piece = board[row][col]
-            if piece == 'P':
-                has_white_pawn = True
-            elif piece == 'p':
-                has_black_pawn = True
-            elif piece == 'R':
-                white_rook = True
-            elif piece == 'r':
-                black_rook = True
-        
-        # Open file (no pawns)
-        if not has_white_pawn and not has_black_pawn:
-            if white_rook:
-                score += 20
-            if black_rook:
-                score -= 20
-        # Semi-open file (only enemy pawns)
-        elif not has_white_pawn and white_rook:
-            score += 10
-        elif not has_black_pawn and black_rook:
-            score -= 10
-    
-    return score
-"""===========================================================================SCORE MOVE==========================================================================="""
-def score_move(from_square , to_square):
-    from_row, from_col = from_square
-    to_row, to_col = to_square
-    
-    piece = board[from_row][from_col]
-    captured = board[to_row][to_col]
-    
-    score = 0
-
-    if captured != '.':
-        piece_values = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 0}
-        captured_value = piece_values.get(captured.upper(), 0)
-        piece_value = piece_values.get(piece.upper(), 0)
-        score = 10 * captured_value - piece_value
-
-    if piece.upper() == 'P':
-        if (piece == 'P' and to_row == 0) or (piece == 'p' and to_row == 7):
-            score += 50
-    if 2 <= to_row <= 5 and 2 <= to_col <= 5:
-        score += 1
-    return score
-"""===========================================================================ORDERED MOVE==========================================================================="""
-def get_ordered_move(color, depth=0):
-    """Return moves ordered by heuristic score.
-
-    Uses MVV-LVA base score (`score_move`) plus history heuristic and killer move bonuses to
-    improve alpha-beta pruning efficiency.
-    """
-    moves = get_all_legal_moves(color)
-
-    move_scores = []
-    killers = killer_moves.get(depth, [])
-    for from_sq, to_sq in moves:
-        base = score_move(from_sq, to_sq)
-        # History heuristic: moves that caused cutoffs previously get higher score
-        hist = history_score.get((from_sq, to_sq), 0)
-        # Killer move bonus: if this move equals a killer at this depth
-        killer_bonus = 0
-        if killers:
-            if (from_sq, to_sq) == killers[0]:
-                killer_bonus = 1000
-            elif len(killers) > 1 and (from_sq, to_sq) == killers[1]:
-                killer_bonus = 800
-
-        total = base + hist + killer_bonus
-        move_scores.append((total, from_sq, to_sq))
-
-    move_scores.sort(reverse=True, key=lambda x: x[0])
-    return [(from_sq, to_sq) for _, from_sq, to_sq in move_scores]
+    return evaluate(live_position, depth)
 """===========================================================================RANDOM MOVE AI==========================================================================="""
 def get_random_move(color):
-    """Get a random legal move for the given color."""
-    all_moves = []
-    
-    # Get all pieces of this color
-    for row in range(8):
-        for col in range(8):
-            piece = board[row][col]
-            if piece == '.':
-                continue
-            
-            piece_color = 'white' if piece.isupper() else 'black'
-            if piece_color == color:
-                moves = get_valid_moves(row, col)
-                for move in moves:
-                    all_moves.append(((row, col), move))
-    
+    """Get a random legal move for the given color; returns a UI move (see `to_ui_move`) or None."""
+    all_moves = movegen.generate_legal_moves(current_position(color))
+
     if not all_moves:
         return None  # No legal moves (checkmate/stalemate)
-    
-    return random.choice(all_moves)
+
+    return to_ui_move(random.choice(all_moves))
 """===========================================================================MATERIAL MOVE AI==========================================================================="""
 def get_best_move_material(color):
-    """Get move that results in best material balance."""
-    global board
-    all_moves = []
-    
-    # Get all legal moves with their resulting positions
-    for r in range(8):
-        for c in range(8):
-            piece = board[r][c]
-            if piece == '.':
-                continue
-            
-            piece_color = 'white' if piece.isupper() else 'black'
-            if piece_color == color:
-                moves = get_valid_moves(r, c)
-                for move in moves:
-                    all_moves.append(((r, c), move))
-    
-    if not all_moves:
-        return None
-    
+    """Get move that results in best material balance; returns a UI move (see `to_ui_move`) or None."""
+    pos = current_position(color)
     best_move = None
     best_score = float('-inf') if color == 'white' else float('inf')
-    
-    for from_square, to_square in all_moves:
-        from_row, from_col = from_square
-        to_row, to_col = to_square
-        
-        # Simulate move - avoid deep copy
-        captured = board[to_row][to_col]
-        piece = board[from_row][from_col]
-        try:
-            apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-        except Exception:
-            pass
-        board[to_row][to_col] = piece
-        board[from_row][from_col] = '.'
-        
-        # Evaluate
-        score = evaluate_board()
-        
-        # Restore board
-        board[from_row][from_col] = piece
-        board[to_row][to_col] = captured
-        try:
-            apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-        except Exception:
-            pass
-        
-        # Check if best
-        if color == 'white':
-            if score > best_score:
-                best_score = score
-                best_move = (from_square, to_square)
-        else:
-            if score < best_score:
-                best_score = score
-                best_move = (from_square, to_square)
-    
-    return best_move
-"""===========================================================================POSITION HASH==========================================================================="""
-def position_hash(side=None):
-    """Create a unique hash for current board position.
-    If `side` is provided, use that as the side-to-move for the key (used by search).
-    """
-    # If incremental `current_zobrist` is available use it (fast O(1)).
-    # If side differs from `current_turn`, flip the side bit.
-    global current_zobrist
-    if current_zobrist is not None:
-        if side is None or side == current_turn:
-            return current_zobrist
-        else:
-            return current_zobrist ^ ZOBRIST_SIDE
-    # Fallback: compute full Zobrist hash
-    return zobrist_hash(side)
-"""===========================================================================BEST MOVE ITERATIVE==========================================================================="""
-def get_best_move_iterative(color, max_time=5.0):
-    """
-    Search with iterative deepening.
-    
-    max_time: Maximum seconds to think
-    """
-    global search_start_time, search_time_limit, transposition_table
-    best_move = None
-    start_time = time.time()
-    search_start_time = start_time
-    search_time_limit = max_time
-
-    # Clear transposition table between full searches to avoid stale bounds
-    transposition_table.clear()
-
-    try:
-        prev_score = 0
-        for depth in range(1, 12):  # Try increasing depths
-            if time.time() - start_time > max_time:
-                break  # Out of time!
-
-            # Aspiration window around previous score for faster searches
-            window = 50  # centipawn window
-            alpha = prev_score - window
-            beta = prev_score + window
-            while True:
-                try:
-                    move, score = minimax_root(color, depth, alpha, beta)
-                    best_move = move
-                    prev_score = score
-                    print(f"Depth {depth}: score {score}, move {move}")
-                    break
-                except TimeoutError:
-                    raise
-                except Exception:
-                    # If result is outside window or other failure, expand window and retry
-                    window *= 2
-                    alpha = prev_score - window
-                    beta = prev_score + window
-                    if window > 10000:
-                        break
-    finally:
-        search_start_time = None
-        search_time_limit = None
-
-    return best_move
-"""===========================================================================MINIMAX ROOT==========================================================================="""
-def minimax_root(color, depth, alpha=float('-inf'), beta=float('inf')):
-    """Top-level minimax that returns best move."""
-    global board
-    moves = get_ordered_move(color, depth)
-    best_move = moves[0] if moves else None
-    best_score = float('-inf') if color == 'white' else float('inf')
-    
-    alpha = float('-inf')
-    beta = float('inf')
-    
-    for move in moves:
-        from_sq, to_sq = move
-        from_row, from_col = from_sq
-        to_row, to_col = to_sq
-        
-        # Make move - store what was captured for undo
-        captured = board[to_row][to_col]
-        piece = board[from_row][from_col]
-        # Update incremental Zobrist for this move
-        try:
-            apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-        except Exception:
-            pass
-        board[to_row][to_col] = piece
-        board[from_row][from_col] = '.'
 
-        # Recurse
-        try:
-            score = minimax(depth - 1, color == 'black', alpha, beta)
-        except TimeoutError:
-            # Undo and re-raise
-            board[from_row][from_col] = piece
-            board[to_row][to_col] = captured
-            raise
-
-        # Undo move - directly restore instead of deep copy
-        board[from_row][from_col] = piece
-        board[to_row][to_col] = captured
-        # Revert incremental Zobrist for this move
-        try:
-            apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-        except Exception:
-            pass
-        
+    for move in movegen.generate_legal_moves(pos):
+        # Simulate move on the engine position and take it back
+        pos.make_move(move)
+        score = evaluate(pos)
+        pos.unmake_move()
+
+        # Check if best
         if color == 'white':
             if score > best_score:
                 best_score = score
                 best_move = move
-            alpha = max(alpha, score)
         else:
             if score < best_score:
                 best_score = score
                 best_move = move
-            beta = min(beta, score)
-        
-        if beta <= alpha:
-            # store PV move for root
-            pv_table[position_hash(color)] = best_move
-            break
-    
-    # store PV at root
-    pv_table[position_hash(color)] = best_move
-    return best_move, best_score
-"""===========================================================================MINIMAX==========================================================================="""
-def minimax(depth, is_maximizing, alpha=float('-inf'), beta=float('inf')):
-    """
-    Minimax with alpha-beta pruning.
-    
-    depth: How many moves to look ahead
-    is_maximizing: True if white's turn, False if black's
-    alpha/beta: For pruning (explained in Lesson 9)
-    """
-    global board
-    # Base case: reached max depth or game over
-    # Time cutoff for iterative deepening
-    if search_start_time is not None and search_time_limit is not None:
-        if time.time() - search_start_time > search_time_limit:
-            raise TimeoutError()
-
-    side = 'white' if is_maximizing else 'black'
-    pos_hash = position_hash(side)
-    if pos_hash in transposition_table:
-        stored_depth, stored_score, stored_flag = transposition_table[pos_hash]
-        if stored_depth >= depth:
-            if stored_flag == 'EXACT':
-                return stored_score
-            elif stored_flag == 'LOWER':
-                alpha = max(alpha, stored_score)
-            elif stored_flag == 'UPPER':
-                beta = min(beta, stored_score)
-            if alpha >= beta:
-                return stored_score
-
-    if depth == 0:
-        final_score =  quiescence_search(alpha , beta , current_depth = 0)
-        transposition_table[pos_hash] = (depth, final_score, 'EXACT')
-        return final_score
-    
-    legal_moves = get_ordered_move('white' if is_maximizing else 'black', depth)
-    
-    if not legal_moves:
-        # Checkmate or stalemate
-        if is_in_check('white' if is_maximizing else 'black'):
-            final_score = -10000 if is_maximizing else 10000  # Checkmate
-        else:
-            final_score = 0  # Stalemate
-        transposition_table[pos_hash] = (depth, final_score, 'EXACT')
-        return final_score
-    
-    if is_maximizing:
-        max_eval = float('-inf')
-        best_move_local = None
-        for from_square, to_square in legal_moves:
-            from_row, from_col = from_square
-            to_row, to_col = to_square
-            
-            # Make move - avoid deep copy
-            captured = board[to_row][to_col]
-            piece = board[from_row][from_col]
-            # Incremental Zobrist update for this move
-            try:
-                apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-            except Exception:
-                pass
-            board[to_row][to_col] = piece
-            board[from_row][from_col] = '.'
-            
-            # Recurse
-            try:
-                eval = minimax(depth - 1, False, alpha, beta)
-            except TimeoutError:
-                raise
-            
-            # Undo move - direct restore
-            board[from_row][from_col] = piece
-            board[to_row][to_col] = captured
-            # Revert incremental Zobrist update for this move
-            try:
-                apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-            except Exception:
-                pass
-            
-            if eval > max_eval:
-                max_eval = eval
-                best_move_local = (from_square, to_square)
-            alpha = max(alpha, eval)
-            if beta <= alpha:
-                # Beta-cutoff: update history heuristic and killers
-                mv = (from_square, to_square)
-                # Do not count captures for history heuristic (optional)
-                captured = board[to_row][to_col]
-                if captured == '.':
-                    history_score[mv] = history_score.get(mv, 0) + depth * depth
-                # Update killer moves for this depth
-                k = killer_moves.get(depth, [])
-                if not k or k[0] != mv:
-                    killer_moves[depth] = [mv] + (k[:1] if k else [])
-                break  # Pruning
-        
-        # Store in transposition table with proper flag
-        # Store PV and transposition info
-        pv_table[pos_hash] = best_move_local
-        if max_eval <= alpha:
-            flag = 'UPPER'
-        elif max_eval >= beta:
-            flag = 'LOWER'
-        else:
-            flag = 'EXACT'
-        transposition_table[pos_hash] = (depth, max_eval, flag)
-        return max_eval
-    
-    else:
-        min_eval = float('inf')
-        best_move_local = None
-        for from_square, to_square in legal_moves:
-            from_row, from_col = from_square
-            to_row, to_col = to_square
-            
-            # Make move - avoid deep copy
-            captured = board[to_row][to_col]
-            piece = board[from_row][from_col]
-            # Incremental Zobrist update for this move
-            try:
-                apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-            except Exception:
-                pass
-            board[to_row][to_col] = piece
-            board[from_row][from_col] = '.'
-            
-            # Recurse
-            try:
-                eval = minimax(depth - 1, True, alpha, beta)
-            except TimeoutError:
-                raise
-            
-            # Undo move - direct restore
-            board[from_row][from_col] = piece
-            board[to_row][to_col] = captured
-            # Revert incremental Zobrist update for this move
-            try:
-                apply_zobrist_move((from_row, from_col), (to_row, to_col), piece, captured)
-            except Exception:
-                pass
-            
-            if eval < min_eval:
-                min_eval = eval
-                best_move_local = (from_square, to_square)
-            beta = min(beta, eval)
-            if beta <= alpha:
-                mv = (from_square, to_square)
-                captured = board[to_row][to_col]
-                if captured == '.':
-                    history_score[mv] = history_score.get(mv, 0) + depth * depth
-                k = killer_moves.get(depth, [])
-                if not k or k[0] != mv:
-                    killer_moves[depth] = [mv] + (k[:1] if k else [])
-                break  # Pruning
-        
-        # Store in transposition table with proper flag
-        pv_table[pos_hash] = best_move_local
-        if min_eval <= alpha:
-            flag = 'UPPER'
-        elif min_eval >= beta:
-            flag = 'LOWER'
-        else:
-            flag = 'EXACT'
-        transposition_table[pos_hash] = (depth, min_eval, flag)
-        return min_eval
-"""===========================================================================QUIESCENCE SEARCH==========================================================================="""
-def quiescence_search(alpha, beta, current_depth=0, max_qs_depth=4):
-    """
-    Optimized quiescence search - only searches captures to avoid horizon effect.
-    
-    current_depth: How deep we are in quiescence (starts at 0)
-    max_qs_depth: Maximum quiescence depth (reduced from before)
-    """
-    # Prevent infinite loops
-    if current_depth >= max_qs_depth:
-        return evaluate_board(depth=5)  # Deep node - fast eval
-    
-    # Stand pat score (if we don't take anything)
-    stand_pat = evaluate_board(depth=5)  # Deep node - fast eval
-    
-    # Beta cutoff
-    if stand_pat >= beta:
-        return beta
-    
-    # Update alpha
-    if alpha < stand_pat:
-        alpha = stand_pat
-    
-    # Get only capture moves (much faster than all moves)
-    capture_moves = []
-    current_color = 'white' if current_depth % 2 == 0 else 'black'
-    
-    for row in range(8):
-        for col in range(8):
-            piece = board[row][col]
-            if piece == '.':
-                continue
-            
-            piece_color = 'white' if piece.isupper() else 'black'
-            if piece_color != current_color:
-                continue
-            
-            moves = get_piece_moves(row, col)
-            for to_row, to_col in moves:
-                target = board[to_row][to_col]
-                if target != '.':  # Only captures
-                    # MVV-LVA ordering (Most Valuable Victim - Least Valuable Attacker)
-                    piece_values = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 0}
-                    victim_value = piece_values.get(target.upper(), 0)
-                    attacker_value = piece_values.get(piece.upper(), 0)
-                    score = victim_value * 10 - attacker_value
-                    capture_moves.append((score, (row, col), (to_row, to_col)))
-    
-    # No captures available
-    if not capture_moves:
-        return stand_pat
-    
-    # Sort captures by MVV-LVA
-    capture_moves.sort(reverse=True, key=lambda x: x[0])
-    
-    # Try captures (only try top 5 to save time)
-    for _, from_square, to_square in capture_moves[:5]:  # Limit to 5 best captures
-        from_row, from_col = from_square
-        to_row, to_col = to_square
-        
-        # Make move
-        captured = board[to_row][to_col]
-        piece = board[from_row][from_col]
-        board[to_row][to_col] = piece
-        board[from_row][from_col] = '.'
-        
-        # Recurse
-        score = -quiescence_search(-beta, -alpha, current_depth + 1, max_qs_depth)
-        
-        # Undo move
-        board[from_row][from_col] = piece
-        board[to_row][to_col] = captured
-        
-        # Update alpha
-        if score >= beta:
-            return beta
-        if score > alpha:
-            alpha = score
-    
-    return alpha
+
+    return to_ui_move(best_move) if best_move else None
+"""===========================================================================BEST MOVE ITERATIVE==========================================================================="""
+def get_best_move_iterative(color, max_time=5.0, max_nodes=None, noise=0, time_manager=None):
+    """Iterative-deepening search for `color`; returns a UI move (see `to_ui_move`) or None."""
+    move = search.get_best_move_iterative(current_position(color), max_time, max_nodes,
+                                          time_manager=time_manager, noise=noise)
+    ai_line[:] = [move_name(m) for m in search.principal_variation]
+    return to_ui_move(move) if move else None
+"""===========================================================================AI MOVE==========================================================================="""
+def get_ai_move(color):
+    """The AI's move at the selected difficulty; under a clock a TimeManager may shorten it further."""
+    level = DIFFICULTY_LEVELS[difficulty]
+    time_manager = None
+    if clocks_enabled():
+        remaining = white_time_remaining if color == 'white' else black_time_remaining
+        time_manager = TimeManager(remaining)
+    return get_best_move_iterative(color, level['time'], level['nodes'], level['noise'], time_manager)
 """===========================================================================GET BEST MOVE MINIMAX==========================================================================="""
 def get_best_move_minimax(color, depth=3):
-    """Get best move using minimax algorithm."""
-    # Use minimax_root for consistent alpha-beta search
-    move, score = minimax_root(color, depth)
-    return move
+    """Get best move using minimax algorithm; returns a UI move (see `to_ui_move`) or None."""
+    move = search.get_best_move_minimax(current_position(color), depth)
+    return to_ui_move(move) if move else None
 """===========================================================================FORMAT TIME==========================================================================="""
 def format_time(seconds):
     mins = int(seconds) // 60
     secs = int(seconds) % 60
     return f"{mins}:{secs:02d}"
 """===========================================================================UPDATE CLOCKS==========================================================================="""
+def clocks_enabled():
+    return time_control is not None and time_control != 'no_clock'
+
 def update_clocks():
     global white_time_remaining, black_time_remaining, last_time_update, current_turn, time_exceeded, game_over, game_result
     
@@ -2732,8 +1393,7 @@ def reset_game():
     global captured_pieces, animating_move, evaluation_history, current_evaluation
     global white_in_check_cached, black_in_check_cached
     global board_history, game_state_history, current_move_index
-    global position_history, halfmove_clock, transposition_table, pv_table
-    global history_score, killer_moves
+    global position_history, halfmove_clock, current_zobrist
     global white_time_remaining, black_time_remaining, last_time_update, time_exceeded
     
     print("\n" + "="*50)
@@ -2781,6 +1441,7 @@ def reset_game():
     # Reset evaluation
     evaluation_history = []
     current_evaluation = 0
+    ai_line.clear()
     
     # Reset check cache
     white_in_check_cached = False
@@ -2796,33 +1457,28 @@ def reset_game():
     halfmove_clock = 0
     
     # Reset AI tables
-    transposition_table = {}
-    pv_table = {}
-    history_score = {}
-    killer_moves = {}
+    search.reset_tables()
     
     # Reset time controls
-    if time_control:
-        white_time_remaining = time_control['time']
-        black_time_remaining = time_control['time']
+    if clocks_enabled():
+        white_time_remaining = TIME_CONTROLS[time_control]
+        black_time_remaining = TIME_CONTROLS[time_control]
         last_time_update = None
         time_exceeded = None
     
-    # Reinitialize zobrist if you're using it
-    try:
-        init_current_zobrist()
-    except:
-        pass
+    # Record the starting position for repetition tracking
+    sync_live_position()
+    current_zobrist = live_position.hash
+    position_history[current_zobrist] = 1
     
     print("NEW GAME STARTED")
     print("Current turn: White")
     print("="*50 + "\n")
 #===========================================================================ZORBIST TABLE===========================================================================
-# Initialize Zobrist table and record initial position for repetition tracking
-init_zobrist(seed=0)
-init_current_zobrist()
-initial_key = get_position_key()
-position_history[initial_key] = position_history.get(initial_key, 0) + 1
+# Record initial position for repetition tracking
+sync_live_position()
+current_zobrist = live_position.hash
+position_history[current_zobrist] = position_history.get(current_zobrist, 0) + 1
 #===========================================================================GAME MODE SELECTION===========================================================================
 def select_game_mode():
     """Display game mode selection screen"""
@@ -2956,13 +1612,13 @@ def select_time_control():
                     control_selected = True
                 elif hover_five:
                     time_control = '5min'
-                    white_time_remaining = 300
-                    black_time_remaining = 300
+                    white_time_remaining = TIME_CONTROLS[time_control]
+                    black_time_remaining = TIME_CONTROLS[time_control]
                     control_selected = True
                 elif hover_ten:
                     time_control = '10min'
-                    white_time_remaining = 600
-                    black_time_remaining = 600
+                    white_time_remaining = TIME_CONTROLS[time_control]
+                    black_time_remaining = TIME_CONTROLS[time_control]
                     control_selected = True
         
         screen.fill((30, 30, 40))
@@ -3028,6 +1684,69 @@ def select_time_control():
             ten_desc_rect = ten_desc_surface.get_rect(center=(ten_min_rect.centerx, ten_min_rect.bottom + 15))
             screen.blit(ten_desc_surface, ten_desc_rect)
         
+        pygame.display.flip()
+def select_difficulty():
+    global difficulty
+    
+    clock_local = pygame.time.Clock()
+    level_selected = False
+    
+    button_width = 220
+    button_height = 70
+    button_spacing = 90
+    
+    buttons = [
+        ('easy', "Easy", "Quick and forgiving", (70, 130, 70), (100, 180, 100), (100, 200, 100), (150, 255, 150)),
+        ('medium', "Medium", "Solid club player", (70, 100, 150), (100, 150, 200), (150, 150, 200), (200, 200, 255)),
+        ('hard', "Hard", "Full strength, up to 5 s", (150, 70, 100), (200, 100, 150), (200, 100, 150), (255, 150, 200)),
+    ]
+    rects = [pygame.Rect(width // 2 - button_width // 2, height // 2 - button_height // 2 + (i - 1) * button_spacing, button_width, button_height)
+             for i in range(len(buttons))]
+    
+    while not level_selected:
+        clock_local.tick(60)
+        mouse_pos = pygame.mouse.get_pos()
+        
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                for (level, *_), rect in zip(buttons, rects):
+                    if rect.collidepoint(mouse_pos):
+                        difficulty = level
+                        level_selected = True
+        
+        screen.fill((30, 30, 40))
+        
+        title = "Difficulty"
+        title_surface = large_font.render(title, True, (255, 215, 0))
+        title_shadow = large_font.render(title, True, (0, 0, 0))
+        title_rect = title_surface.get_rect(center=(width // 2, height // 4))
+        title_shadow_rect = title_shadow.get_rect(center=(width // 2 + 3, height // 4 + 3))
+        screen.blit(title_shadow, title_shadow_rect)
+        screen.blit(title_surface, title_rect)
+        
+        subtitle = "Select AI Strength"
+        subtitle_surface = small_font.render(subtitle, True, (200, 200, 200))
+        subtitle_rect = subtitle_surface.get_rect(center=(width // 2, height // 4 + 70))
+        screen.blit(subtitle_surface, subtitle_rect)
+        
+        for (level, text, desc, color, hover_color, border, hover_border), rect in zip(buttons, rects):
+            hover = rect.collidepoint(mouse_pos)
+            pygame.draw.rect(screen, hover_color if hover else color, rect)
+            pygame.draw.rect(screen, hover_border if hover else border, rect, 3)
+            
+            text_surface = font.render(text, True, White)
+            text_rect = text_surface.get_rect(center=rect.center)
+            screen.blit(text_surface, text_rect)
+            
+            if hover:
+                desc_surface = tiny_font.render(desc, True, (200, 200, 200))
+                desc_rect = desc_surface.get_rect(center=(rect.centerx, rect.bottom + 15))
+                screen.blit(desc_surface, desc_rect)
+        
         pygame.display.flip()
 """===========================================================================TEST AI SPEED==========================================================================="""
 def test_ai_speed():
@@ -3051,7 +1770,7 @@ def test_ai_speed():
             elapsed = time.time() - start
             
             if move:
-                from_sq, to_sq = move
+                from_sq, to_sq, _ = move
                 from_row, from_col = from_sq
                 to_row, to_col = to_sq
                 move_str = f"{Files[from_col]}{8-from_row}{Files[to_col]}{8-to_row}"
@@ -3085,10 +1804,12 @@ for row in board:
 # First, show game mode selection
 select_game_mode()
 print(f"Game mode selected: {game_mode}")
-# If two-player mode, show time control selection
-if game_mode == 'two_player':
-    select_time_control()
-    print(f"Time control selected: {time_control}")
+if game_mode == 'ai':
+    select_difficulty()
+    print(f"Difficulty selected: {difficulty}")
+# Then the time control (the AI budgets its thinking time from its clock)
+select_time_control()
+print(f"Time control selected: {time_control}")
 """===========================================================================SETUP==========================================================================="""
 run = True
 clock = pygame.time.Clock()
@@ -3240,8 +1961,8 @@ while run:
     
         # Update animation
         update_animation()
-        # Update clocks in 2-player mode
-        if game_mode == 'two_player':
+        # Update clocks
+        if clocks_enabled():
             update_clocks()
         
         
@@ -3254,18 +1975,24 @@ while run:
             draw_right_panel()
             draw_ai_thinking_overlay()
             pygame.display.flip()
-            move = get_best_move_minimax('black' , depth = 4)
+            move = get_ai_move('black')
             ai_is_thinking = False
-            if move:
-                from_square, to_square = move
+            if clocks_enabled():
+                update_clocks()  # Charge the thinking time to the AI's clock before the turn passes
+            if move and not game_over:
+                from_square, to_square, promotion = move
                 move_piece(from_square, to_square)
+                if promotion_pending and promotion:
+                    # The AI picks its own promotion piece instead of showing the menu
+                    promote_pawn(to_square[0], to_square[1], promotion)
+                    promotion_pending = None
                 if not promotion_pending:
                     switch_turn()
 
     draw_board()
     draw_pieces()
     new_game_button_rect = draw_right_panel()
-    if game_mode == 'two_player':
+    if clocks_enabled():
         draw_clocks()
     draw_game_over()
     draw_promotion_ui()
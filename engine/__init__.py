@@ -0,0 +1,2 @@
+"""Bitboard chess engine behind chess_v2.py: position, move generation, evaluation and search."""
+from engine.position import Position
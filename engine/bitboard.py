@@ -0,0 +1,80 @@
+"""Bitboard constants and helpers shared by the engine modules.
+
+Squares use the same numbering as the UI board: index = row * 8 + col, where row 0 is
+Black's back rank (rank 8) and col 0 is the a-file. Bit `i` of a bitboard is square `i`.
+"""
+#===========================================================================COLORS & PIECES===========================================================================
+WHITE = 0
+BLACK = 1
+
+# Piece types (0-5) and piece codes (type + 6 * color)
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+WP, WN, WB, WR, WQ, WK = range(6)
+BP, BN, BB, BR, BQ, BK = range(6, 12)
+EMPTY = 12  # Mailbox value for an empty square (indexes a 13th "nothing" slot in piece tables)
+
+PIECE_SYMBOLS = 'PNBRQKpnbrqk'
+SYMBOL_TO_PIECE = {symbol: i for i, symbol in enumerate(PIECE_SYMBOLS)}
+COLOR_NAMES = ('white', 'black')
+#===========================================================================MASKS===========================================================================
+FULL = 0xFFFFFFFFFFFFFFFF
+
+FILE_A = 0x0101010101010101
+FILE_MASKS = [FILE_A << col for col in range(8)]
+ROW_MASKS = [0xFF << (8 * row) for row in range(8)]
+
+NOT_FILE_A = FULL ^ FILE_MASKS[0]
+NOT_FILE_H = FULL ^ FILE_MASKS[7]
+NOT_FILE_AB = NOT_FILE_A & (FULL ^ FILE_MASKS[1])
+NOT_FILE_GH = NOT_FILE_H & (FULL ^ FILE_MASKS[6])
+
+# Files next to each file (used for isolated pawns)
+ADJACENT_FILES = [
+    (FILE_MASKS[col - 1] if col > 0 else 0) | (FILE_MASKS[col + 1] if col < 7 else 0)
+    for col in range(8)
+]
+#===========================================================================SQUARES===========================================================================
+def square(row, col):
+    return row * 8 + col
+
+def square_row_col(sq):
+    return sq >> 3, sq & 7
+
+def square_name(sq):
+    return f"{'abcdefgh'[sq & 7]}{8 - (sq >> 3)}"
+#===========================================================================BIT HELPERS===========================================================================
+def lsb(bb):
+    """Index of the lowest set bit."""
+    return (bb & -bb).bit_length() - 1
+
+def popcount(bb):
+    return bin(bb).count('1')
+
+def iter_bits(bb):
+    """Yield the square index of each set bit, lowest first."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+#===========================================================================SHIFT ATTACKS===========================================================================
+def knight_attacks_bb(bb):
+    """All squares attacked by the knights in `bb`."""
+    l1 = (bb >> 1) & NOT_FILE_H
+    l2 = (bb >> 2) & NOT_FILE_GH
+    r1 = (bb << 1) & NOT_FILE_A
+    r2 = (bb << 2) & NOT_FILE_AB
+    h1 = l1 | r1
+    h2 = l2 | r2
+    return ((h1 << 16) | (h1 >> 16) | (h2 << 8) | (h2 >> 8)) & FULL
+
+def king_attacks_bb(bb):
+    """All squares attacked by the kings in `bb`."""
+    attacks = ((bb << 1) & NOT_FILE_A) | ((bb >> 1) & NOT_FILE_H)
+    row = bb | attacks
+    return (attacks | (row << 8) | (row >> 8)) & FULL
+
+def pawn_attacks_bb(color, bb):
+    """All squares attacked by pawns of `color` standing on `bb`."""
+    if color == WHITE:
+        return ((bb >> 9) & NOT_FILE_H) | ((bb >> 7) & NOT_FILE_A)
+    return (((bb << 7) & NOT_FILE_H) | ((bb << 9) & NOT_FILE_A)) & FULL
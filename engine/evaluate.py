@@ -0,0 +1,226 @@
+"""Static evaluation on bitboards (centipawns, positive = good for White)."""
+from engine.bitboard import (
+    WHITE, BLACK, WP, WN, WB, WR, WQ, BP, BN, BB, BR, BQ,
+    FILE_MASKS, ADJACENT_FILES, popcount,
+)
+#===========================================================================PIECE-SQUARE TABLES===========================================================================
+PIECE_VALUES = [100, 320, 330, 500, 900, 20000]
+# Pawn table - encourage advancement and center control
+PAWN_TABLE = [
+    [0,   0,   0,   0,   0,   0,   0,   0],
+    [50,  50,  50,  50,  50,  50,  50,  50],
+    [10,  10,  20,  30,  30,  20,  10,  10],
+    [5,   5,   10,  25,  25,  10,  5,   5],
+    [0,   0,   0,   20,  20,  0,   0,   0],
+    [5,   -5,  -10, 0,   0,   -10, -5,  5],
+    [5,   10,  10,  -20, -20, 10,  10,  5],
+    [0,   0,   0,   0,   0,   0,   0,   0]
+]
+# Knight table - prefer center, avoid edges
+KNIGHT_TABLE = [
+    [-50, -40, -30, -30, -30, -30, -40, -50],
+    [-40, -20, 0,   0,   0,   0,   -20, -40],
+    [-30, 0,   10,  15,  15,  10,  0,   -30],
+    [-30, 5,   15,  20,  20,  15,  5,   -30],
+    [-30, 0,   15,  20,  20,  15,  0,   -30],
+    [-30, 5,   10,  15,  15,  10,  5,   -30],
+    [-40, -20, 0,   5,   5,   0,   -20, -40],
+    [-50, -40, -30, -30, -30, -30, -40, -50]
+]
+# Bishop table - prefer long diagonals
+BISHOP_TABLE = [
+    [-20, -10, -10, -10, -10, -10, -10, -20],
+    [-10, 0,   0,   0,   0,   0,   0,   -10],
+    [-10, 0,   5,   10,  10,  5,   0,   -10],
+    [-10, 5,   5,   10,  10,  5,   5,   -10],
+    [-10, 0,   10,  10,  10,  10,  0,   -10],
+    [-10, 10,  10,  10,  10,  10,  10,  -10],
+    [-10, 5,   0,   0,   0,   0,   5,   -10],
+    [-20, -10, -10, -10, -10, -10, -10, -20]
+]
+# Rook table - prefer 7th rank and open files
+ROOK_TABLE = [
+    [0,  0,  0,  0,  0,  0,  0,  0],
+    [5,  10, 10, 10, 10, 10, 10, 5],
+    [-5, 0,  0,  0,  0,  0,  0,  -5],
+    [-5, 0,  0,  0,  0,  0,  0,  -5],
+    [-5, 0,  0,  0,  0,  0,  0,  -5],
+    [-5, 0,  0,  0,  0,  0,  0,  -5],
+    [-5, 0,  0,  0,  0,  0,  0,  -5],
+    [0,  0,  0,  5,  5,  0,  0,  0]
+]
+# Queen table - prefer center, avoid early development
+QUEEN_TABLE = [
+    [-20, -10, -10, -5,  -5,  -10, -10, -20],
+    [-10, 0,   0,   0,   0,   0,   0,   -10],
+    [-10, 0,   5,   5,   5,   5,   0,   -10],
+    [-5,  0,   5,   5,   5,   5,   0,   -5],
+    [0,   0,   5,   5,   5,   5,   0,   -5],
+    [-10, 5,   5,   5,   5,   5,   0,   -10],
+    [-10, 0,   5,   0,   0,   0,   0,   -10],
+    [-20, -10, -10, -5,  -5,  -10, -10, -20]
+]
+# King table - stay safe in early/mid game
+KING_MIDDLE_GAME = [
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-30, -40, -40, -50, -50, -40, -40, -30],
+    [-20, -30, -30, -40, -40, -30, -30, -20],
+    [-10, -20, -20, -20, -20, -20, -20, -10],
+    [20,  20,  0,   0,   0,   0,   20,  20],
+    [20,  30,  10,  0,   0,   10,  30,  20]
+]
+# King endgame table - be active in center
+KING_END_GAME = [
+    [-50, -40, -30, -20, -20, -30, -40, -50],
+    [-30, -20, -10, 0,   0,   -10, -20, -30],
+    [-30, -10, 20,  30,  30,  20,  -10, -30],
+    [-30, -10, 30,  40,  40,  30,  -10, -30],
+    [-30, -10, 30,  40,  40,  30,  -10, -30],
+    [-30, -10, 20,  30,  30,  20,  -10, -30],
+    [-30, -30, 0,   0,   0,   0,   -30, -30],
+    [-50, -30, -30, -30, -30, -30, -30, -50]
+]
+
+def _signed_tables(value, table):
+    """Material + square bonus per square for the white and black piece (black mirrored and negated)."""
+    flat = [v for row in table for v in row]
+    white = [value + flat[sq] for sq in range(64)]
+    black = [-(value + flat[sq ^ 56]) for sq in range(64)]
+    return white, black
+
+# PST[piece][sq]: material + positional value, signed from White's point of view
+PST = [None] * 12
+for _type, _table in enumerate((PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE)):
+    PST[_type], PST[_type + 6] = _signed_tables(PIECE_VALUES[_type], _table)
+KING_MG_PST = _signed_tables(PIECE_VALUES[5], KING_MIDDLE_GAME)
+KING_EG_PST = _signed_tables(PIECE_VALUES[5], KING_END_GAME)
+#===========================================================================MASKS===========================================================================
+def _mask(squares):
+    bb = 0
+    for row, col in squares:
+        bb |= 1 << (row * 8 + col)
+    return bb
+
+CENTER = _mask([(3, 3), (3, 4), (4, 3), (4, 4)])
+EXTENDED_CENTER = _mask([(2, 2), (2, 3), (2, 4), (2, 5),
+                         (3, 2), (3, 5), (4, 2), (4, 5),
+                         (5, 2), (5, 3), (5, 4), (5, 5)])
+
+# 5x5 box around the king, and the three squares in front of it (pawn shield) per color
+KING_ZONE = [_mask([(r, c) for r in range(sq // 8 - 2, sq // 8 + 3) for c in range(sq % 8 - 2, sq % 8 + 3)
+                    if 0 <= r < 8 and 0 <= c < 8]) for sq in range(64)]
+PAWN_SHIELD = [
+    [_mask([(sq // 8 + d, c) for c in range(sq % 8 - 1, sq % 8 + 2) if 0 <= sq // 8 + d < 8 and 0 <= c < 8])
+     for sq in range(64)]
+    for d in (-1, 1)
+]
+#===========================================================================EVALUATE===========================================================================
+def material_count(pos, color):
+    """Material in pawn units (P=1, N=B=3, R=5, Q=9), as shown in the UI panel."""
+    pieces = pos.pieces
+    base = 6 * color
+    return (popcount(pieces[base]) + 3 * popcount(pieces[base + 1] | pieces[base + 2]) +
+            5 * popcount(pieces[base + 3]) + 9 * popcount(pieces[base + 4]))
+
+def evaluate(pos, depth=0):
+    """
+    Depth-dependent evaluation:
+    depth > 2  - material + piece-square tables only (deep nodes)
+    depth <= 2 - adds center control, rooks on open files, bishop pair
+    depth <= 1 - adds pawn structure and king safety
+    """
+    pieces = pos.pieces
+    score = 0
+    for piece in (WP, WN, WB, WR, WQ, BP, BN, BB, BR, BQ):
+        table = PST[piece]
+        bb = pieces[piece]
+        while bb:
+            low = bb & -bb
+            score += table[low.bit_length() - 1]
+            bb ^= low
+
+    # Endgame king table once total material (pawn units) drops below 30
+    if material_count(pos, WHITE) + material_count(pos, BLACK) < 30:
+        white_king_table, black_king_table = KING_EG_PST
+    else:
+        white_king_table, black_king_table = KING_MG_PST
+    white_king, black_king = pos.king_sq
+    if white_king != -1:
+        score += white_king_table[white_king]
+    if black_king != -1:
+        score += black_king_table[black_king]
+
+    if depth > 2:
+        return score
+
+    white = pos.occupied[WHITE]
+    black = pos.occupied[BLACK]
+    score += 10 * (popcount(white & CENTER) - popcount(black & CENTER))
+    score += 5 * (popcount(white & EXTENDED_CENTER) - popcount(black & EXTENDED_CENTER))
+    score += evaluate_rook_on_open_file(pos)
+    if popcount(pieces[WB]) >= 2:
+        score += 30
+    if popcount(pieces[BB]) >= 2:
+        score -= 30
+
+    if depth <= 1:
+        score += evaluate_pawn_structure(pos)
+        score += evaluate_king_safety(pos, WHITE) - evaluate_king_safety(pos, BLACK)
+    return score
+
+def evaluate_rook_on_open_file(pos):
+    pieces = pos.pieces
+    white_pawns, black_pawns = pieces[WP], pieces[BP]
+    white_rooks, black_rooks = pieces[WR], pieces[BR]
+    score = 0
+    for file_mask in FILE_MASKS:
+        white_rook = white_rooks & file_mask
+        black_rook = black_rooks & file_mask
+        if not (white_rook or black_rook):
+            continue
+        has_white_pawn = white_pawns & file_mask
+        has_black_pawn = black_pawns & file_mask
+        if not has_white_pawn and not has_black_pawn:
+            # Open file (no pawns)
+            if white_rook:
+                score += 20
+            if black_rook:
+                score -= 20
+        # Semi-open file (only enemy pawns)
+        elif not has_white_pawn and white_rook:
+            score += 10
+        elif not has_black_pawn and black_rook:
+            score -= 10
+    return score
+
+def evaluate_pawn_structure(pos):
+    white_pawns = pos.pieces[WP]
+    black_pawns = pos.pieces[BP]
+    score = 0
+    for col in range(8):
+        file_mask = FILE_MASKS[col]
+        white_count = popcount(white_pawns & file_mask)
+        black_count = popcount(black_pawns & file_mask)
+        # Doubled pawns
+        if white_count > 1:
+            score -= 10 * (white_count - 1)
+        if black_count > 1:
+            score += 10 * (black_count - 1)
+        # Isolated pawns (no friendly pawn on an adjacent file)
+        if white_count and not white_pawns & ADJACENT_FILES[col]:
+            score -= 15 * white_count
+        if black_count and not black_pawns & ADJACENT_FILES[col]:
+            score += 15 * black_count
+    return score
+
+def evaluate_king_safety(pos, color):
+    king_sq = pos.king_sq[color]
+    if king_sq == -1:
+        return 0
+    pawns = pos.pieces[WP if color == WHITE else BP]
+    # Pawn shield in front of the king, minus enemy pieces close to it
+    safety = 10 * popcount(pawns & PAWN_SHIELD[color][king_sq])
+    safety -= 5 * popcount(pos.occupied[color ^ 1] & KING_ZONE[king_sq])
+    return safety
@@ -0,0 +1,40 @@
+"""Compact 16-bit move encoding used throughout the engine.
+
+bits 0-5   from square
+bits 6-11  to square
+bits 12-13 promotion piece (0 = knight .. 3 = queen), only meaningful with the PROMOTION flag
+bits 14-15 flag: 0 normal, PROMOTION, EN_PASSANT or CASTLING
+
+Move 0 (a8 to a8) can never be played, so NO_MOVE = 0 marks "no move" in tables.
+Hot loops decode inline (`move & 63`, `move >> 6 & 63`); the helpers below are for everything else.
+"""
+from engine.bitboard import KNIGHT, square_name
+#===========================================================================FLAGS===========================================================================
+NO_MOVE = 0
+PROMOTION = 1 << 14
+EN_PASSANT = 2 << 14
+CASTLING = 3 << 14
+FLAG_MASK = 3 << 14
+#===========================================================================ENCODE / DECODE===========================================================================
+def encode_move(frm, to, promotion=0, flag=0):
+    """Pack a move; `promotion` is a piece type (KNIGHT..QUEEN) or 0, `flag` EN_PASSANT or CASTLING."""
+    if promotion:
+        return frm | to << 6 | (promotion - KNIGHT) << 12 | PROMOTION
+    return frm | to << 6 | flag
+
+def move_from(move):
+    return move & 63
+
+def move_to(move):
+    return move >> 6 & 63
+
+def move_promotion(move):
+    """Promotion piece type (KNIGHT..QUEEN), or 0 if the move is not a promotion."""
+    if move & FLAG_MASK == PROMOTION:
+        return (move >> 12 & 3) + KNIGHT
+    return 0
+
+def move_name(move):
+    """Coordinate notation such as 'e2e4' or 'e7e8q' (for logs and debugging)."""
+    promotion = move_promotion(move)
+    return square_name(move & 63) + square_name(move >> 6 & 63) + ('.nbrq'[promotion] if promotion else '')
@@ -0,0 +1,360 @@
+"""Bitboard legal move generation and attack detection."""
+from engine.bitboard import (
+    WHITE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, EMPTY, FULL, NOT_FILE_A, NOT_FILE_H, ROW_MASKS,
+)
+from engine.tables import (
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_RAYS, BISHOP_RAYS, BETWEEN, LINE,
+    ROOK_MASKS, ROOK_TABLE, BISHOP_MASKS, BISHOP_TABLE, rook_attacks, bishop_attacks,
+)
+from engine.position import WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from engine.move import encode_move, PROMOTION, EN_PASSANT, CASTLING, FLAG_MASK
+
+# Promotion bits to OR into `from | to << 6`, queen first
+PROMOTION_CODES = [encode_move(0, 0, promotion) for promotion in (QUEEN, KNIGHT, ROOK, BISHOP)]
+
+# Squares that must be empty / not attacked for each castle: (right, king move, empty, safe)
+CASTLING_MOVES = [
+    [(WHITE_KINGSIDE, encode_move(60, 62, flag=CASTLING), (1 << 61) | (1 << 62), (61, 62)),
+     (WHITE_QUEENSIDE, encode_move(60, 58, flag=CASTLING), (1 << 57) | (1 << 58) | (1 << 59), (59, 58))],
+    [(BLACK_KINGSIDE, encode_move(4, 6, flag=CASTLING), (1 << 5) | (1 << 6), (5, 6)),
+     (BLACK_QUEENSIDE, encode_move(4, 2, flag=CASTLING), (1 << 1) | (1 << 2) | (1 << 3), (3, 2))],
+]
+#===========================================================================ATTACKS===========================================================================
+def is_square_attacked(pos, sq, by_color):
+    """True if any piece of `by_color` attacks square `sq`."""
+    pieces = pos.pieces
+    base = 6 * by_color
+    if PAWN_ATTACKS[by_color ^ 1][sq] & pieces[base]:
+        return True
+    if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+        return True
+    if KING_ATTACKS[sq] & pieces[base + 5]:
+        return True
+    queens = pieces[base + QUEEN]
+    rooks = (pieces[base + ROOK] | queens) & ROOK_RAYS[sq]
+    if rooks and ROOK_TABLE[sq][pos.all_occupied & ROOK_MASKS[sq]] & rooks:
+        return True
+    bishops = (pieces[base + BISHOP] | queens) & BISHOP_RAYS[sq]
+    if bishops and BISHOP_TABLE[sq][pos.all_occupied & BISHOP_MASKS[sq]] & bishops:
+        return True
+    return False
+
+def attackers_to(pos, sq, by_color, occupied):
+    """Bitboard of `by_color` pieces attacking `sq`, with sliders blocked by `occupied`."""
+    pieces = pos.pieces
+    base = 6 * by_color
+    queens = pieces[base + QUEEN]
+    return ((PAWN_ATTACKS[by_color ^ 1][sq] & pieces[base])
+            | (KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT])
+            | (KING_ATTACKS[sq] & pieces[base + 5])
+            | (ROOK_TABLE[sq][occupied & ROOK_MASKS[sq]] & (pieces[base + ROOK] | queens))
+            | (BISHOP_TABLE[sq][occupied & BISHOP_MASKS[sq]] & (pieces[base + BISHOP] | queens)))
+
+def in_check(pos, color=None):
+    """True if `color` (default: side to move) has its king attacked."""
+    if color is None:
+        color = pos.side
+    return is_square_attacked(pos, pos.king_sq[color], color ^ 1)
+
+def pinned_pieces(pos, color, king):
+    """Bitboard of `color` pieces absolutely pinned to the king on square `king`."""
+    pieces = pos.pieces
+    base = 6 * (color ^ 1)
+    queens = pieces[base + QUEEN]
+    snipers = (((pieces[base + ROOK] | queens) & ROOK_RAYS[king])
+               | ((pieces[base + BISHOP] | queens) & BISHOP_RAYS[king]))
+    occupied = pos.all_occupied
+    own = pos.occupied[color]
+    pinned = 0
+    while snipers:
+        low = snipers & -snipers
+        snipers ^= low
+        blockers = BETWEEN[king][low.bit_length() - 1] & occupied
+        # Exactly one piece in between, and it's ours
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pinned |= blockers
+    return pinned
+#===========================================================================GIVES CHECK===========================================================================
+def check_info(pos):
+    """
+    What gives_check needs to know about the side to move, computed once per node:
+    (enemy king square, check squares, discoverers). check_squares[t] are the squares a piece
+    of type t would check the enemy king from; discoverers are our pieces that are the only
+    piece between one of our sliders and the enemy king (moving them off the line checks).
+    """
+    us = pos.side
+    king = pos.king_sq[us ^ 1]
+    occupied = pos.all_occupied
+    diagonal = bishop_attacks(king, occupied)
+    straight = rook_attacks(king, occupied)
+    check_squares = (PAWN_ATTACKS[us ^ 1][king], KNIGHT_ATTACKS[king], diagonal, straight,
+                     diagonal | straight, 0)
+
+    pieces = pos.pieces
+    base = 6 * us
+    queens = pieces[base + QUEEN]
+    snipers = (((pieces[base + ROOK] | queens) & ROOK_RAYS[king])
+               | ((pieces[base + BISHOP] | queens) & BISHOP_RAYS[king]))
+    own = pos.occupied[us]
+    discoverers = 0
+    while snipers:
+        low = snipers & -snipers
+        snipers ^= low
+        blockers = BETWEEN[king][low.bit_length() - 1] & occupied
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            discoverers |= blockers
+    return king, check_squares, discoverers
+
+def gives_check(pos, move, info=None):
+    """
+    True if `move` (legal, for the side to move) checks the enemy king, without making it.
+    info: check_info(pos), when several moves of the same node are tested
+    """
+    king, check_squares, discoverers = info or check_info(pos)
+    frm = move & 63
+    to = move >> 6 & 63
+    # Direct check from the target square, or a discovered one by leaving the line to the king
+    if check_squares[pos.mailbox[frm] % 6] >> to & 1:
+        return True
+    if discoverers >> frm & 1 and not LINE[king][frm] >> to & 1:
+        return True
+    flag = move & FLAG_MASK
+    if not flag:
+        return False
+
+    us = pos.side
+    occupied = pos.all_occupied ^ (1 << frm)
+    if flag == PROMOTION:
+        # The promoted piece attacks from `to`, possibly through the square the pawn just left
+        promoted = (move >> 12 & 3) + KNIGHT
+        if promoted == KNIGHT:
+            return bool(KNIGHT_ATTACKS[to] >> king & 1)
+        attacks = 0
+        if promoted != BISHOP:
+            attacks |= rook_attacks(to, occupied)
+        if promoted != ROOK:
+            attacks |= bishop_attacks(to, occupied)
+        return bool(attacks >> king & 1)
+    if flag == EN_PASSANT:
+        # Removing the captured pawn as well may open a line to the king
+        occupied ^= (1 << to) | (1 << (to + 8 if us == WHITE else to - 8))
+        pieces = pos.pieces
+        base = 6 * us
+        queens = pieces[base + QUEEN]
+        return bool(rook_attacks(king, occupied) & (pieces[base + ROOK] | queens)
+                    or bishop_attacks(king, occupied) & (pieces[base + BISHOP] | queens))
+    # Castling: the rook checks from its new square
+    rook_from, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+    occupied ^= (1 << to) | (1 << rook_from) | (1 << rook_to)
+    return bool(rook_attacks(rook_to, occupied) >> king & 1)
+#===========================================================================LEGAL MOVES===========================================================================
+def generate_legal_moves(pos, captures_only=False, quiets_only=False):
+    """
+    Legal moves for the side to move.
+
+    Checkers and pins are found once: in check, non-king moves must capture the checker or
+    block its ray (double check: king moves only); pinned pieces stay on their pin line; the
+    king only steps to squares that are safe once it has left its square. En passant, which
+    can uncover a check along the rank, is the one case tested by making the move.
+    captures_only: captures plus push promotions (for quiescence search)
+    quiets_only: everything else - the complement of captures_only (staged move ordering)
+    """
+    moves = []
+    append = moves.append
+    us = pos.side
+    them = us ^ 1
+    pieces = pos.pieces
+    own = pos.occupied[us]
+    enemy = pos.occupied[them]
+    occupied = pos.all_occupied
+    empty = FULL ^ occupied
+    if captures_only:
+        targets = enemy
+    elif quiets_only:
+        targets = empty
+    else:
+        targets = FULL ^ own
+    base = 6 * us
+    king = pos.king_sq[us]
+    checkers = attackers_to(pos, king, them, occupied)
+
+    # King
+    without_king = occupied ^ (1 << king)
+    attacks = KING_ATTACKS[king] & targets
+    while attacks:
+        low = attacks & -attacks
+        attacks ^= low
+        to = low.bit_length() - 1
+        if not attackers_to(pos, to, them, without_king):
+            append(king | to << 6)
+    if checkers & (checkers - 1):
+        return moves  # Double check: only the king can move
+
+    # Squares that resolve a single check (capture the checker or block it)
+    if checkers:
+        evasion = checkers | BETWEEN[king][checkers.bit_length() - 1]
+    else:
+        evasion = FULL
+    targets &= evasion
+    pinned = pinned_pieces(pos, us, king)
+    line = LINE[king]
+
+    # Pawns, set-wise
+    pawns = pieces[base]
+    if us == WHITE:
+        push_shift, left_shift, right_shift = -8, -9, -7
+        single = (pawns >> 8) & empty
+        double = ((single & ROW_MASKS[5]) >> 8) & empty
+        left = (pawns >> 9) & NOT_FILE_H & enemy
+        right = (pawns >> 7) & NOT_FILE_A & enemy
+        promo_row = ROW_MASKS[0]
+    else:
+        push_shift, left_shift, right_shift = 8, 7, 9
+        single = (pawns << 8) & empty
+        double = ((single & ROW_MASKS[2]) << 8) & empty
+        left = (pawns << 7) & NOT_FILE_H & enemy
+        right = (pawns << 9) & NOT_FILE_A & enemy
+        promo_row = ROW_MASKS[7]
+    single &= evasion
+    if captures_only:
+        single &= promo_row
+        double = 0
+    elif quiets_only:
+        single &= ~promo_row
+        left = right = 0
+
+    for bb, shift in ((left & evasion, left_shift), (right & evasion, right_shift),
+                      (single, push_shift), (double & evasion, 2 * push_shift)):
+        while bb:
+            low = bb & -bb
+            to = low.bit_length() - 1
+            bb ^= low
+            frm = to - shift
+            if (1 << frm) & pinned and not line[frm] & low:
+                continue
+            if low & promo_row:
+                for code in PROMOTION_CODES:
+                    append(frm | to << 6 | code)
+            else:
+                append(frm | to << 6)
+    if pos.ep_square != -1 and not quiets_only:
+        attackers = PAWN_ATTACKS[them][pos.ep_square] & pawns
+        while attackers:
+            low = attackers & -attackers
+            attackers ^= low
+            move = (low.bit_length() - 1) | pos.ep_square << 6 | EN_PASSANT
+            pos.make_move(move)
+            if not is_square_attacked(pos, king, them):
+                append(move)
+            pos.unmake_move()
+
+    # Pieces (pinned knights can never move)
+    knights = pieces[base + KNIGHT] & ~pinned
+    while knights:
+        low = knights & -knights
+        frm = low.bit_length() - 1
+        knights ^= low
+        attacks = KNIGHT_ATTACKS[frm] & targets
+        while attacks:
+            tlow = attacks & -attacks
+            attacks ^= tlow
+            append(frm | (tlow.bit_length() - 1) << 6)
+    for piece_type in (BISHOP, ROOK, QUEEN):
+        bb = pieces[base + piece_type]
+        while bb:
+            low = bb & -bb
+            frm = low.bit_length() - 1
+            bb ^= low
+            if piece_type == BISHOP:
+                attacks = BISHOP_TABLE[frm][occupied & BISHOP_MASKS[frm]]
+            elif piece_type == ROOK:
+                attacks = ROOK_TABLE[frm][occupied & ROOK_MASKS[frm]]
+            else:
+                attacks = ROOK_TABLE[frm][occupied & ROOK_MASKS[frm]] | BISHOP_TABLE[frm][occupied & BISHOP_MASKS[frm]]
+            attacks &= targets
+            if low & pinned:
+                attacks &= line[frm]
+            while attacks:
+                tlow = attacks & -attacks
+                attacks ^= tlow
+                append(frm | (tlow.bit_length() - 1) << 6)
+
+    # Castling (never out of check)
+    if not captures_only and pos.castling and not checkers:
+        for right, castle, must_be_empty, must_be_safe in CASTLING_MOVES[us]:
+            if pos.castling & right and not occupied & must_be_empty:
+                if not any(is_square_attacked(pos, sq, them) for sq in must_be_safe):
+                    append(castle)
+    return moves
+
+def is_legal_move(pos, move):
+    """True if `move` is legal here (for moves remembered from other nodes: hash moves, killers)."""
+    frm = move & 63
+    to = move >> 6 & 63
+    flag = move & FLAG_MASK
+    us = pos.side
+    piece = pos.mailbox[frm]
+    if piece == EMPTY or piece // 6 != us or pos.occupied[us] >> to & 1:
+        return False
+    piece_type = piece % 6
+    to_bit = 1 << to
+
+    if flag == CASTLING:
+        for right, castle, must_be_empty, must_be_safe in CASTLING_MOVES[us]:
+            if castle == move:
+                return bool(pos.castling & right and not pos.all_occupied & must_be_empty
+                            and not in_check(pos)
+                            and not any(is_square_attacked(pos, sq, us ^ 1) for sq in must_be_safe))
+        return False
+    if piece_type == PAWN:
+        if (flag == PROMOTION) != (to_bit & (ROW_MASKS[0] | ROW_MASKS[7]) != 0):
+            return False
+        if flag == EN_PASSANT:
+            if to != pos.ep_square or not PAWN_ATTACKS[us][frm] & to_bit:
+                return False
+        elif pos.mailbox[to] != EMPTY:
+            if not PAWN_ATTACKS[us][frm] & to_bit:
+                return False
+        else:
+            step = -8 if us == WHITE else 8
+            start_row = 6 if us == WHITE else 1
+            if to != frm + step and not (to == frm + 2 * step and frm >> 3 == start_row
+                                         and pos.mailbox[frm + step] == EMPTY):
+                return False
+    elif flag:
+        return False
+    elif piece_type == KNIGHT:
+        if not KNIGHT_ATTACKS[frm] & to_bit:
+            return False
+    elif piece_type == KING:
+        if not KING_ATTACKS[frm] & to_bit:
+            return False
+    else:
+        occupied = pos.all_occupied
+        attacks = 0
+        if piece_type != BISHOP:
+            attacks |= ROOK_TABLE[frm][occupied & ROOK_MASKS[frm]]
+        if piece_type != ROOK:
+            attacks |= BISHOP_TABLE[frm][occupied & BISHOP_MASKS[frm]]
+        if not attacks & to_bit:
+            return False
+
+    # Pseudo-legal: play it and make sure our king is not left attacked
+    pos.make_move(move)
+    legal = not is_square_attacked(pos, pos.king_sq[us], us ^ 1)
+    pos.unmake_move()
+    return legal
+
+def perft(pos, depth):
+    """Count leaf nodes of the legal move tree (move generator correctness check)."""
+    if depth == 0:
+        return 1
+    moves = generate_legal_moves(pos)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        pos.make_move(move)
+        nodes += perft(pos, depth - 1)
+        pos.unmake_move()
+    return nodes
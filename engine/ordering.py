@@ -0,0 +1,48 @@
+"""Quiet-move ordering heuristics: killer moves, butterfly history and countermoves.
+
+All tables are fixed-size lists allocated once:
+    killers[ply]                    - the last two quiet moves that caused a cutoff at this ply
+    history[side * 4096 + from_to]  - butterfly history, from_to = move & 4095
+    countermoves[from_to]           - the quiet move that last refuted the move from_to
+History updates use gravity (a bonus shrinks as the score approaches HISTORY_MAX), so scores
+stay bounded without periodic rescaling; age() halves them between searches.
+"""
+from engine.move import NO_MOVE
+
+MAX_PLY = 64
+HISTORY_MAX = 16384
+HISTORY_BONUS_MAX = 1200  # Bonus for depth d is min(d * d * 16, this)
+
+class MoveHeuristics:
+    __slots__ = ('killers', 'history', 'countermoves')
+
+    def __init__(self):
+        self.killers = [[NO_MOVE, NO_MOVE] for _ in range(MAX_PLY)]
+        self.history = [0] * (2 * 4096)
+        self.countermoves = [NO_MOVE] * 4096
+
+    def clear(self):
+        """Forget everything (new game)."""
+        for pair in self.killers:
+            pair[0] = pair[1] = NO_MOVE
+        self.history[:] = [0] * len(self.history)
+        self.countermoves[:] = [NO_MOVE] * len(self.countermoves)
+
+    def age(self):
+        """Start a new search: killers belong to the old tree, history keeps half its weight."""
+        for pair in self.killers:
+            pair[0] = pair[1] = NO_MOVE
+        self.history[:] = [value // 2 for value in self.history]
+
+    def update(self, side, move, prev_move, ply, depth):
+        """A quiet move caused a beta cutoff: make it a killer and the countermove to prev_move, and raise its history."""
+        if ply < MAX_PLY:
+            pair = self.killers[ply]
+            if pair[0] != move:
+                pair[1] = pair[0]
+                pair[0] = move
+        if prev_move:
+            self.countermoves[prev_move & 4095] = move
+        bonus = min(depth * depth * 16, HISTORY_BONUS_MAX)
+        i = side * 4096 + (move & 4095)
+        self.history[i] += bonus - self.history[i] * bonus // HISTORY_MAX
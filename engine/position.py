@@ -0,0 +1,334 @@
+"""Bitboard position: twelve piece sets, colour occupancy, mailbox and incremental Zobrist hash."""
+import random
+
+from engine.bitboard import (
+    WHITE, BLACK, PAWN, KNIGHT, KING, ROOK, EMPTY, WP, WK, WR, BP, BK, BR,
+    PIECE_SYMBOLS, SYMBOL_TO_PIECE,
+)
+from engine.move import NO_MOVE, PROMOTION, EN_PASSANT, CASTLING, FLAG_MASK
+#===========================================================================CASTLING RIGHTS===========================================================================
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+
+# Castling rights that survive a move touching each square (king and rook home squares clear rights)
+CASTLING_KEEP = [15] * 64
+CASTLING_KEEP[60] = 15 ^ (WHITE_KINGSIDE | WHITE_QUEENSIDE)  # e1
+CASTLING_KEEP[63] = 15 ^ WHITE_KINGSIDE                      # h1
+CASTLING_KEEP[56] = 15 ^ WHITE_QUEENSIDE                     # a1
+CASTLING_KEEP[4] = 15 ^ (BLACK_KINGSIDE | BLACK_QUEENSIDE)   # e8
+CASTLING_KEEP[7] = 15 ^ BLACK_KINGSIDE                       # h8
+CASTLING_KEEP[0] = 15 ^ BLACK_QUEENSIDE                      # a8
+#===========================================================================ZOBRIST KEYS===========================================================================
+# Quick comment: one random 64-bit key per (piece, square), castling-rights mask, en-passant file and side.
+_rnd = random.Random(2024)
+ZOBRIST_PIECE = [[_rnd.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_CASTLING = [_rnd.getrandbits(64) for _ in range(16)]
+ZOBRIST_EP = [_rnd.getrandbits(64) for _ in range(8)]
+ZOBRIST_SIDE = _rnd.getrandbits(64)
+del _rnd
+#===========================================================================POSITION===========================================================================
+class Position:
+    """Chess position stored as bitboards.
+
+    pieces[p]   - bitboard of piece code p (WP..BK); doubles as each side's piece list
+                  (pieces[6 * color + type], iterate the set bits)
+    occupied[c] - bitboard of all pieces of color c
+    mailbox[sq] - piece code on each square (EMPTY if none), for O(1) "what is on sq"
+    king_sq[c]  - square of each king (-1 if absent), kept up to date by make/unmake
+    undo_stack  - one (move, captured, castling, ep_square, halfmove_clock, hash) record per
+                  move made, popped by unmake_move (move is NO_MOVE for a null move)
+    Moves are 16-bit ints (see engine.move); their flags say which special rule applies.
+    """
+    __slots__ = ('pieces', 'occupied', 'all_occupied', 'mailbox', 'side', 'castling',
+                 'ep_square', 'halfmove_clock', 'hash', 'undo_stack', 'king_sq')
+
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occupied = [0, 0]
+        self.all_occupied = 0
+        self.mailbox = [EMPTY] * 64
+        self.side = WHITE
+        self.castling = 0
+        self.ep_square = -1
+        self.halfmove_clock = 0
+        self.hash = 0
+        self.undo_stack = []
+        self.king_sq = [-1, -1]
+
+    #===========================================================================CONSTRUCTION===========================================================================
+    @classmethod
+    def from_board(cls, board, side='white', piece_moved=None, en_passant_target=None, halfmove_clock=0):
+        """Build a position from the UI's 8x8 list of piece symbols and game-state globals."""
+        pos = cls()
+        for row in range(8):
+            for col in range(8):
+                symbol = board[row][col]
+                if symbol != '.':
+                    pos.put_piece(SYMBOL_TO_PIECE[symbol], row * 8 + col)
+        pos.side = WHITE if side == 'white' else BLACK
+
+        moved = piece_moved or {}
+        mailbox = pos.mailbox
+        castling = 0
+        if mailbox[60] == WK and not moved.get('white_king'):
+            if mailbox[63] == WR and not moved.get('white_rook_h'):
+                castling |= WHITE_KINGSIDE
+            if mailbox[56] == WR and not moved.get('white_rook_a'):
+                castling |= WHITE_QUEENSIDE
+        if mailbox[4] == BK and not moved.get('black_king'):
+            if mailbox[7] == BR and not moved.get('black_rook_h'):
+                castling |= BLACK_KINGSIDE
+            if mailbox[0] == BR and not moved.get('black_rook_a'):
+                castling |= BLACK_QUEENSIDE
+        pos.castling = castling
+
+        if en_passant_target is not None:
+            ep_row, ep_col = en_passant_target
+            pos.ep_square = ep_row * 8 + ep_col
+        pos.halfmove_clock = halfmove_clock
+        pos.hash = pos.compute_hash()
+        return pos
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Build a position from a FEN string (used by benchmarks and analysis)."""
+        fields = fen.split()
+        pos = cls()
+        for row, rank in enumerate(fields[0].split('/')):
+            col = 0
+            for ch in rank:
+                if ch.isdigit():
+                    col += int(ch)
+                else:
+                    pos.put_piece(SYMBOL_TO_PIECE[ch], row * 8 + col)
+                    col += 1
+        pos.side = WHITE if len(fields) < 2 or fields[1] == 'w' else BLACK
+        rights = fields[2] if len(fields) > 2 else '-'
+        pos.castling = ((WHITE_KINGSIDE if 'K' in rights else 0) | (WHITE_QUEENSIDE if 'Q' in rights else 0) |
+                        (BLACK_KINGSIDE if 'k' in rights else 0) | (BLACK_QUEENSIDE if 'q' in rights else 0))
+        if len(fields) > 3 and fields[3] != '-':
+            pos.ep_square = (8 - int(fields[3][1])) * 8 + 'abcdefgh'.index(fields[3][0])
+        if len(fields) > 4:
+            pos.halfmove_clock = int(fields[4])
+        pos.hash = pos.compute_hash()
+        return pos
+
+    def copy(self):
+        pos = Position.__new__(Position)
+        pos.pieces = self.pieces[:]
+        pos.occupied = self.occupied[:]
+        pos.all_occupied = self.all_occupied
+        pos.mailbox = self.mailbox[:]
+        pos.side = self.side
+        pos.castling = self.castling
+        pos.ep_square = self.ep_square
+        pos.halfmove_clock = self.halfmove_clock
+        pos.hash = self.hash
+        pos.undo_stack = self.undo_stack[:]
+        pos.king_sq = self.king_sq[:]
+        return pos
+
+    def to_board(self):
+        """Return the position as the UI's 8x8 list of piece symbols."""
+        symbols = PIECE_SYMBOLS + '.'
+        mailbox = self.mailbox
+        return [[symbols[mailbox[row * 8 + col]] for col in range(8)] for row in range(8)]
+
+    def compute_hash(self):
+        """Full Zobrist hash from scratch (the incremental hash must always match this)."""
+        h = 0
+        for sq, piece in enumerate(self.mailbox):
+            if piece != EMPTY:
+                h ^= ZOBRIST_PIECE[piece][sq]
+        h ^= ZOBRIST_CASTLING[self.castling]
+        if self.ep_square != -1:
+            h ^= ZOBRIST_EP[self.ep_square & 7]
+        if self.side == BLACK:
+            h ^= ZOBRIST_SIDE
+        return h
+
+    #===========================================================================PIECE ACCESS===========================================================================
+    def put_piece(self, piece, sq):
+        bit = 1 << sq
+        self.pieces[piece] |= bit
+        self.occupied[piece // 6] |= bit
+        self.all_occupied |= bit
+        self.mailbox[sq] = piece
+        if piece % 6 == KING:
+            self.king_sq[piece // 6] = sq
+
+    def piece_at(self, sq):
+        return self.mailbox[sq]
+
+    def king_square(self, color):
+        return self.king_sq[color]
+
+    #===========================================================================MAKE / UNMAKE===========================================================================
+    def make_move(self, move):
+        """Play `move` in place (castling, en passant, promotion and hash included); undo with unmake_move."""
+        frm = move & 63
+        to = move >> 6 & 63
+        flag = move & FLAG_MASK
+        pieces = self.pieces
+        occupied = self.occupied
+        mailbox = self.mailbox
+        us = self.side
+        them = us ^ 1
+        piece = mailbox[frm]
+        captured = mailbox[to]
+        self.undo_stack.append((move, captured, self.castling, self.ep_square, self.halfmove_clock, self.hash))
+        h = self.hash ^ ZOBRIST_SIDE ^ ZOBRIST_CASTLING[self.castling]
+        if self.ep_square != -1:
+            h ^= ZOBRIST_EP[self.ep_square & 7]
+
+        from_bit = 1 << frm
+        to_bit = 1 << to
+        if captured != EMPTY:
+            pieces[captured] ^= to_bit
+            occupied[them] ^= to_bit
+            h ^= ZOBRIST_PIECE[captured][to]
+
+        move_bits = from_bit | to_bit
+        pieces[piece] ^= move_bits
+        occupied[us] ^= move_bits
+        mailbox[frm] = EMPTY
+        mailbox[to] = piece
+        h ^= ZOBRIST_PIECE[piece][frm] ^ ZOBRIST_PIECE[piece][to]
+
+        new_ep = -1
+        piece_type = piece % 6
+        if piece_type == PAWN:
+            if flag == EN_PASSANT:
+                # En passant: the captured pawn sits behind the target square
+                cap_sq = to + 8 if us == WHITE else to - 8
+                cap_piece = BP if us == WHITE else WP
+                cap_bit = 1 << cap_sq
+                pieces[cap_piece] ^= cap_bit
+                occupied[them] ^= cap_bit
+                mailbox[cap_sq] = EMPTY
+                h ^= ZOBRIST_PIECE[cap_piece][cap_sq]
+            elif to - frm == 16 or frm - to == 16:
+                new_ep = (frm + to) >> 1
+            elif flag == PROMOTION:
+                promoted = (move >> 12 & 3) + KNIGHT + 6 * us
+                pieces[piece] ^= to_bit
+                pieces[promoted] |= to_bit
+                mailbox[to] = promoted
+                h ^= ZOBRIST_PIECE[piece][to] ^ ZOBRIST_PIECE[promoted][to]
+            self.halfmove_clock = 0
+        else:
+            if piece_type == KING:
+                self.king_sq[us] = to
+            if flag == CASTLING:
+                # Castling: move the rook across the king
+                if to > frm:
+                    rook_from, rook_to = frm + 3, frm + 1
+                else:
+                    rook_from, rook_to = frm - 4, frm - 1
+                rook = ROOK + 6 * us
+                rook_bits = (1 << rook_from) | (1 << rook_to)
+                pieces[rook] ^= rook_bits
+                occupied[us] ^= rook_bits
+                mailbox[rook_from] = EMPTY
+                mailbox[rook_to] = rook
+                h ^= ZOBRIST_PIECE[rook][rook_from] ^ ZOBRIST_PIECE[rook][rook_to]
+            if captured != EMPTY:
+                self.halfmove_clock = 0
+            else:
+                self.halfmove_clock += 1
+
+        self.castling &= CASTLING_KEEP[frm] & CASTLING_KEEP[to]
+        h ^= ZOBRIST_CASTLING[self.castling]
+        if new_ep != -1:
+            h ^= ZOBRIST_EP[new_ep & 7]
+        self.ep_square = new_ep
+        self.all_occupied = occupied[0] | occupied[1]
+        self.side = them
+        self.hash = h
+
+    def unmake_move(self):
+        """Take back the last move made with make_move."""
+        move, captured, castling, ep_square, halfmove_clock, h = self.undo_stack.pop()
+        frm = move & 63
+        to = move >> 6 & 63
+        flag = move & FLAG_MASK
+        pieces = self.pieces
+        occupied = self.occupied
+        mailbox = self.mailbox
+        them = self.side
+        us = them ^ 1
+        to_bit = 1 << to
+        piece = mailbox[to]
+        if flag == PROMOTION:
+            pieces[piece] ^= to_bit
+            piece = PAWN + 6 * us
+            pieces[piece] |= to_bit
+
+        move_bits = (1 << frm) | to_bit
+        pieces[piece] ^= move_bits
+        occupied[us] ^= move_bits
+        mailbox[frm] = piece
+        mailbox[to] = captured
+        if captured != EMPTY:
+            pieces[captured] |= to_bit
+            occupied[them] |= to_bit
+        if flag == EN_PASSANT:
+            cap_sq = to + 8 if us == WHITE else to - 8
+            cap_piece = BP if us == WHITE else WP
+            cap_bit = 1 << cap_sq
+            pieces[cap_piece] |= cap_bit
+            occupied[them] |= cap_bit
+            mailbox[cap_sq] = cap_piece
+        elif piece % 6 == KING:
+            self.king_sq[us] = frm
+            if flag == CASTLING:
+                if to > frm:
+                    rook_from, rook_to = frm + 3, frm + 1
+                else:
+                    rook_from, rook_to = frm - 4, frm - 1
+                rook = ROOK + 6 * us
+                rook_bits = (1 << rook_from) | (1 << rook_to)
+                pieces[rook] ^= rook_bits
+                occupied[us] ^= rook_bits
+                mailbox[rook_to] = EMPTY
+                mailbox[rook_from] = rook
+
+        self.all_occupied = occupied[0] | occupied[1]
+        self.side = us
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.hash = h
+
+    def is_repetition(self):
+        """
+        True if this position already occurred since the last capture or pawn move. The undo
+        records hold the hash before each move, so only every second one (same side to move)
+        back to the halfmove clock can match; the scan stops at a null move.
+        """
+        stack = self.undo_stack
+        h = self.hash
+        for back in range(1, min(self.halfmove_clock, len(stack)) + 1):
+            record = stack[-back]
+            if record[0] == NO_MOVE:
+                return False
+            if not back & 1 and record[5] == h:
+                return True
+        return False
+
+    def make_null_move(self):
+        """Pass the turn (null-move pruning); undo with unmake_null_move. Pushes a NO_MOVE record."""
+        self.undo_stack.append((NO_MOVE, EMPTY, self.castling, self.ep_square, self.halfmove_clock, self.hash))
+        h = self.hash ^ ZOBRIST_SIDE
+        if self.ep_square != -1:
+            h ^= ZOBRIST_EP[self.ep_square & 7]
+            self.ep_square = -1
+        self.halfmove_clock += 1
+        self.side ^= 1
+        self.hash = h
+
+    def unmake_null_move(self):
+        _, _, _, self.ep_square, self.halfmove_clock, self.hash = self.undo_stack.pop()
+        self.side ^= 1
@@ -0,0 +1,571 @@
+"""Negamax principal variation search over bitboard positions.
+
+Scores are in centipawns for the side to move.
+"""
+import math
+import random
+import time
+
+from engine.bitboard import WHITE, EMPTY
+from engine.evaluate import evaluate
+from engine.movegen import generate_legal_moves, is_legal_move, in_check, check_info, gives_check
+from engine.see import see
+from engine.move import NO_MOVE, PROMOTION, CASTLING, FLAG_MASK, move_name
+from engine.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from engine.ordering import MoveHeuristics, MAX_PLY
+
+MATE_SCORE = 10000
+DRAW_SCORE = 0
+INFINITY = 3 * MATE_SCORE  # Window bound no score can reach (ints, so null windows are alpha, alpha + 1)
+ASPIRATION_WINDOW = 50  # Half-width of the first root window around the previous iteration's score
+IID_DEPTH = 4  # Internal iterative deepening: minimum depth of a PV node searched without a hash move
+NULL_MOVE_DEPTH = 3    # Null-move pruning: minimum depth
+NULL_VERIFY_DEPTH = 6  # From this depth a null-move cutoff is confirmed by a reduced normal search
+# Late move reductions: LMR_TABLE[depth][moves searched], for quiet moves from LMR_MOVES on
+LMR_DEPTH = 3
+LMR_MOVES = 3
+LMR_TABLE = [[int(0.75 + math.log(depth) * math.log(count) / 2.25) if depth and count else 0
+              for count in range(64)] for depth in range(64)]
+# Move-count pruning: at depth d <= 3 (non-PV), quiet moves after the first LMP_MOVES[d] are skipped
+LMP_MOVES = (0, 5, 8, 13)
+# Frontier pruning margins (centipawns) indexed by remaining depth, used at non-PV nodes not in check
+REVERSE_FUTILITY_MARGINS = (0, 120, 240, 360)  # static eval - margin >= beta: return without searching
+RAZOR_MARGINS = (0, 300, 550)                   # static eval + margin < alpha: let quiescence decide
+FUTILITY_MARGINS = (0, 150, 300, 500)           # static eval + margin <= alpha: skip quiet moves
+DELTA_MARGIN = 200  # Quiescence: skip captures that can't lift stand pat to within this of alpha
+POLL_NODES = 256  # Stop conditions (clock, node limit, stop()) are checked once per this many nodes
+# MVV-LVA values indexed by piece code (EMPTY scores 0)
+ORDER_VALUES = [1, 3, 3, 5, 9, 0, 1, 3, 3, 5, 9, 0, 0]
+#===========================================================================SEARCH STATE===========================================================================
+transposition_table = TranspositionTable()  # Kept between moves; see set_hash_size()
+heuristics = MoveHeuristics()  # Killers, history and countermoves for quiet-move ordering
+root_bonus = {}     # root move -> deliberate random bonus (centipawns) for weaker play; empty at full strength
+nodes = 0
+# Triangular PV array: pv_table[ply][ply:pv_length[ply]] is the best line found from the node
+# at `ply` of the current path, built bottom-up as PV nodes raise alpha
+pv_table = [[NO_MOVE] * (MAX_PLY + 1) for _ in range(MAX_PLY + 1)]
+pv_length = [0] * (MAX_PLY + 1)
+principal_variation = []  # PV of the last completed iteration (moves from the root)
+
+class SearchFrame:
+    """What the search keeps about the node at one ply of the current path."""
+    __slots__ = ('current_move', 'static_eval', 'killers')
+
+    def __init__(self, killers):
+        self.current_move = NO_MOVE   # Move being searched here (NO_MOVE for a null move)
+        self.static_eval = -INFINITY  # -INFINITY when not computed (PV node or in check)
+        self.killers = killers        # heuristics.killers[ply] itself, so update() and age() reach it
+
+search_stack = [SearchFrame(heuristics.killers[ply]) for ply in range(MAX_PLY)]  # search_stack[ply], created once
+#===========================================================================STOPPING===========================================================================
+# The stop token of the running search. Once `stopped` is set every node returns at once and
+# each caller, seeing the flag right after unmake_move, passes it up without storing anything,
+# so the search unwinds through its normal make/unmake pairs and the position ends up untouched.
+# start_limits numbers the searches and stop() names the one it is for, so a stop that arrives
+# after its search has finished can't cut the next one short.
+current_search = 0  # Number of the running search, or of the last one
+stop_request = None  # Number of the search stop() was last called for (None: never called)
+external_stop = None  # The caller's Event for the running search (e.g. a multiprocessing.Event), or None
+search_deadline = None
+search_node_limit = None
+stopped = False
+
+def next_search_id():
+    """The number the next search will get (see stop())."""
+    return current_search + 1
+
+def stop(search_id=None):
+    """
+    Ask a search to finish (safe from another thread of this process); it returns its best
+    completed result.
+    search_id: The search to stop. Default: the running one; when none is running, the call does
+               nothing. To cancel a search whose thread may not have started it yet, read
+               next_search_id() before handing the search over and pass that.
+    """
+    global stop_request
+    stop_request = current_search if search_id is None else search_id
+
+def start_limits(max_time=None, max_nodes=None, event=None):
+    """Arm the stop token for a new search: seconds, nodes and/or an Event that someone else may set."""
+    global current_search, external_stop, search_deadline, search_node_limit, stopped, nodes
+    current_search += 1
+    external_stop = event
+    search_deadline = time.time() + max_time if max_time is not None else None
+    search_node_limit = max_nodes
+    stopped = False
+    nodes = 0
+
+def clear_limits():
+    global external_stop, search_deadline, search_node_limit, stopped
+    external_stop = None
+    search_deadline = None
+    search_node_limit = None
+    stopped = False
+
+def poll_stop():
+    """Set `stopped` if the clock ran out, the node budget is spent or stop() was called."""
+    global stopped
+    if (stop_request == current_search
+            or (external_stop is not None and external_stop.is_set())
+            or (search_deadline is not None and time.time() >= search_deadline)
+            or (search_node_limit is not None and nodes >= search_node_limit)):
+        stopped = True
+    return stopped
+
+def reset_tables():
+    """Forget everything learned in previous searches (new game)."""
+    transposition_table.clear()
+    heuristics.clear()
+
+def set_hash_size(size_mb):
+    """Resize the transposition table to about `size_mb` megabytes (clears it)."""
+    transposition_table.resize(size_mb)
+def static_eval(pos):
+    """Fast evaluation for the side to move (material and piece-square tables)."""
+    score = evaluate(pos, depth=5)
+    return score if pos.side == WHITE else -score
+#===========================================================================MOVE ORDERING===========================================================================
+def score_move(pos, move):
+    frm = move & 63
+    to = move >> 6 & 63
+    mailbox = pos.mailbox
+    captured = mailbox[to]
+    score = 0
+    if captured != EMPTY:
+        score = 10 * ORDER_VALUES[captured] - ORDER_VALUES[mailbox[frm]]
+    if move & FLAG_MASK == PROMOTION:
+        score += 50
+    row, col = to >> 3, to & 7
+    if 2 <= row <= 5 and 2 <= col <= 5:
+        score += 1
+    return score
+
+def is_quiet(pos, move):
+    """Not a capture, en passant or promotion (the moves killers and history are kept for)."""
+    return pos.mailbox[move >> 6 & 63] == EMPTY and move & FLAG_MASK in (0, CASTLING)
+
+def pick_moves(pos, ply=0, hash_move=NO_MOVE):
+    """
+    Staged move picker: yield the hash move, then captures and promotions that don't lose
+    material (by SEE, MVV-LVA breaking ties), then the killers of this ply and the countermove
+    to the previous move, then the remaining quiet moves by history score, and the losing
+    captures last.
+
+    Each stage is only generated once the previous one is used up, so a beta cutoff on an
+    early move never pays for generating and sorting the quiet moves. Stages are sorted as
+    ints, score << 16 | move, instead of (score, move) tuples; `key & 0xFFFF` is the move.
+    """
+    if hash_move and is_legal_move(pos, hash_move):
+        yield hash_move
+
+    captures = []
+    bad_captures = []
+    for move in generate_legal_moves(pos, captures_only=True):
+        if move != hash_move:
+            gain = see(pos, move)
+            key = (gain * 256 + score_move(pos, move)) << 16 | move  # score_move is 0..255 here
+            (captures if gain >= 0 else bad_captures).append(key)
+    captures.sort(reverse=True)
+    for key in captures:
+        yield key & 0xFFFF
+
+    refutations = []
+    prev_move = search_stack[ply - 1].current_move if ply else NO_MOVE
+    candidates = list(search_stack[ply].killers)
+    if prev_move:
+        candidates.append(heuristics.countermoves[prev_move & 4095])
+    for move in candidates:
+        if (move and move != hash_move and move not in refutations
+                and is_quiet(pos, move) and is_legal_move(pos, move)):
+            refutations.append(move)
+            yield move
+
+    history = heuristics.history
+    base = pos.side * 4096
+    quiets = [(history[base + (move & 4095)] + score_move(pos, move)) << 16 | move
+              for move in generate_legal_moves(pos, quiets_only=True)
+              if move != hash_move and move not in refutations]
+    quiets.sort(reverse=True)
+    for key in quiets:
+        yield key & 0xFFFF
+
+    bad_captures.sort(reverse=True)
+    for key in bad_captures:
+        yield key & 0xFFFF
+#===========================================================================ROOT===========================================================================
+def search_root(pos, depth, alpha=-INFINITY, beta=INFINITY):
+    """
+    Top-level PVS that returns (best_move, score).
+
+    The score is fail-soft: at or below `alpha` / at or above `beta` means the true score lies
+    outside the window and the caller must search again with a wider one.
+    """
+    # Try the last root search's best move first: the previous iteration's PV move, or the move
+    # that just failed the aspiration window
+    if pv_length[0]:
+        hash_move = pv_table[0][0]
+    else:
+        entry = transposition_table.probe(pos.hash)
+        hash_move = entry[3] if entry is not None else NO_MOVE
+    alpha_orig = alpha
+    best_move = None
+    best_score = -INFINITY
+    pv_length[0] = 0
+
+    for move in pick_moves(pos, 0, hash_move):
+        # The move's bonus is added to its score, so its subtree is searched with the window shifted by it
+        bonus = root_bonus.get(move, 0)
+        search_stack[0].current_move = move
+        pos.make_move(move)
+        if best_move is None:
+            score = bonus - negamax(pos, depth - 1, bonus - beta, bonus - alpha, 1)
+        else:
+            score = bonus - negamax(pos, depth - 1, bonus - alpha - 1, bonus - alpha, 1)
+            if alpha < score < beta:
+                score = bonus - negamax(pos, depth - 1, bonus - beta, bonus - alpha, 1)
+        pos.unmake_move()
+        if stopped:
+            return best_move, best_score  # Incomplete: the caller must not trust it
+        if score > best_score:
+            best_score = score
+            best_move = move
+            update_pv(0, move)
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+
+    if best_move is not None:
+        transposition_table.store(pos.hash, depth, best_score, bound_flag(best_score, alpha_orig, beta), best_move)
+    return best_move, best_score
+#===========================================================================PRINCIPAL VARIATION SEARCH===========================================================================
+def update_pv(ply, move):
+    """`move` raised alpha at `ply`: the line from here is now it, followed by the child's line."""
+    row = pv_table[ply]
+    row[ply] = move
+    end = pv_length[ply + 1]
+    row[ply + 1:end] = pv_table[ply + 1][ply + 1:end]
+    pv_length[ply] = end
+
+def bound_flag(score, alpha, beta):
+    """How a fail-soft score relates to the window it was searched with."""
+    if score <= alpha:
+        return UPPER
+    if score >= beta:
+        return LOWER
+    return EXACT
+
+def negamax(pos, depth, alpha=-INFINITY, beta=INFINITY, ply=0, allow_null=True):
+    """
+    Principal variation search.
+
+    The first (best-ordered) move is searched with the full window; every later move gets a
+    null-window scout search that only proves it is no better, and is re-searched with the
+    full window when the scout fails high. Nodes with beta - alpha > 1 are PV nodes.
+    depth: How many moves to look ahead
+    ply: Distance from the root (indexes the per-ply killers and the PV array)
+    allow_null: False right after a null move and in null-move verification searches
+    """
+    global nodes
+    pv_length[ply] = ply
+    nodes += 1
+    if not nodes % POLL_NODES:
+        poll_stop()
+    if stopped:
+        return 0
+    if ply >= MAX_PLY:
+        return static_eval(pos)
+
+    # A repeated position (inside the tree or with the game before it) or 50 reversible moves
+    # is a draw: the cycle is not searched again
+    if ply and (pos.halfmove_clock >= 100 or pos.is_repetition()):
+        return DRAW_SCORE
+
+    pos_hash = pos.hash
+    entry = transposition_table.probe(pos_hash)
+    if entry is not None:
+        stored_depth, stored_score, stored_flag, hash_move, _ = entry
+        if stored_depth >= depth:
+            if stored_flag == LOWER:
+                alpha = max(alpha, stored_score)
+            elif stored_flag == UPPER:
+                beta = min(beta, stored_score)
+            if stored_flag == EXACT or alpha >= beta:
+                if hash_move:
+                    pv_table[ply][ply] = hash_move  # The line goes on through the stored best move
+                    pv_length[ply] = ply + 1
+                return stored_score
+    else:
+        hash_move = NO_MOVE
+
+    if depth <= 0:
+        return quiescence_search(pos, alpha, beta)
+
+    frame = search_stack[ply]
+    pv_node = beta - alpha > 1
+    checked = in_check(pos)
+    futile = False
+    if not pv_node and not checked:
+        static = frame.static_eval = static_eval(pos)
+        if depth < len(REVERSE_FUTILITY_MARGINS) and -MATE_SCORE < beta < MATE_SCORE:
+            # Reverse futility: so far above beta that no reply will bring it back
+            if static - REVERSE_FUTILITY_MARGINS[depth] >= beta:
+                return static
+            # Razoring: hopelessly below alpha, only a tactic can help - ask quiescence
+            if depth < len(RAZOR_MARGINS) and static + RAZOR_MARGINS[depth] < alpha:
+                score = quiescence_search(pos, alpha, beta, ply=ply)
+                if score <= alpha:
+                    return score
+            # Futility: quiet moves can't raise the score enough to reach alpha
+            futile = static + FUTILITY_MARGINS[depth] <= alpha
+    else:
+        static = frame.static_eval = -INFINITY
+
+    # Null-move pruning: if passing still fails high, a real move will too. Not at PV nodes,
+    # in check or with only pawns left (zugzwang, where passing would be the best move)
+    us = pos.side
+    if (allow_null and depth >= NULL_MOVE_DEPTH and static >= beta
+            and pos.occupied[us] ^ pos.pieces[6 * us] ^ pos.pieces[6 * us + 5]):
+        reduction = 3 if depth >= 6 else 2
+        frame.current_move = NO_MOVE
+        pos.make_null_move()
+        score = -negamax(pos, depth - 1 - reduction, -beta, -beta + 1, ply + 1, False)
+        pos.unmake_null_move()
+        if stopped:
+            return 0
+        if score >= beta:
+            if score >= MATE_SCORE:
+                score = beta  # Don't trust a mate found by passing
+            if depth < NULL_VERIFY_DEPTH or negamax(pos, depth - reduction, alpha, beta, ply, False) >= beta:
+                return score
+
+    # Internal iterative deepening: a PV node with no hash move gets one from a shallower search
+    if not hash_move and depth >= IID_DEPTH and pv_node:
+        negamax(pos, depth - 2, alpha, beta, ply)
+        entry = transposition_table.probe(pos_hash)
+        if entry is not None:
+            hash_move = entry[3]
+
+    alpha_orig = alpha
+    best_score = -INFINITY
+    best_move = NO_MOVE
+    moves_searched = 0
+    pv_length[ply] = ply  # IID and null-move verification searched this ply already
+    info = None  # check_info(pos), computed once the first late quiet move needs it
+    for move in pick_moves(pos, ply, hash_move):
+        quiet = is_quiet(pos, move)
+        # Late quiet moves rarely matter: skip them near the leaves (futile or past the move
+        # count), search them shallower elsewhere (never when either side is in check)
+        late_quiet = False
+        if moves_searched and quiet and not checked:
+            if info is None:
+                info = check_info(pos)
+            late_quiet = not gives_check(pos, move, info)
+            if (late_quiet and not pv_node and best_score > -MATE_SCORE
+                    and (futile or depth < len(LMP_MOVES) and moves_searched >= LMP_MOVES[depth])):
+                continue
+        frame.current_move = move
+        pos.make_move(move)
+        if moves_searched == 0:
+            score = -negamax(pos, depth - 1, -beta, -alpha, ply + 1)
+        else:
+            reduction = 0
+            if late_quiet and depth >= LMR_DEPTH and moves_searched >= LMR_MOVES:
+                reduction = LMR_TABLE[min(depth, 63)][min(moves_searched, 63)] - pv_node
+                reduction = max(0, min(reduction, depth - 2))
+            score = -negamax(pos, depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)
+            if reduction and score > alpha:
+                score = -negamax(pos, depth - 1, -alpha - 1, -alpha, ply + 1)  # Reduced search failed high: verify at full depth
+            if alpha < score < beta:
+                score = -negamax(pos, depth - 1, -beta, -alpha, ply + 1)
+        pos.unmake_move()
+        if stopped:
+            return 0
+        moves_searched += 1
+        if score > best_score:
+            best_score = score
+            best_move = move
+            if score > alpha:
+                alpha = score
+                if pv_node:
+                    update_pv(ply, move)
+                if alpha >= beta:
+                    # Cutoff: a quiet move becomes a killer / countermove and gains history
+                    if quiet:
+                        prev_move = search_stack[ply - 1].current_move if ply else NO_MOVE
+                        heuristics.update(pos.side, move, prev_move, ply, depth)
+                    break
+
+    if best_move == NO_MOVE:
+        # No legal moves: checkmate or stalemate
+        best_score = -MATE_SCORE if checked else 0
+        transposition_table.store(pos_hash, depth, best_score, EXACT)
+        return best_score
+
+    transposition_table.store(pos_hash, depth, best_score, bound_flag(best_score, alpha_orig, beta), best_move)
+    return best_score
+#===========================================================================QUIESCENCE SEARCH===========================================================================
+def quiescence_search(pos, alpha, beta, current_depth=0, max_qs_depth=4, ply=None):
+    """
+    Search captures until the position is quiet, so the static eval is never taken in the
+    middle of an exchange (negamax, fail-soft: score is for the side to move).
+
+    In check there is no standing pat: every evasion is searched and no evasion means mate.
+    Otherwise only captures and promotions that don't lose material (SEE) are tried, minus
+    those that can't bring the score back to alpha even if they win what SEE promises (delta
+    pruning), plus safe quiet checks at the first ply. Results go to the transposition table
+    as depth-0 entries.
+    current_depth: How deep we are in quiescence (starts at 0)
+    max_qs_depth: Maximum quiescence depth
+    ply: Set by a negamax node not in check that already has its static eval in search_stack[ply]
+    """
+    global nodes
+    nodes += 1
+    if not nodes % POLL_NODES:
+        poll_stop()
+    if stopped:
+        return 0
+    pos_hash = pos.hash
+    entry = transposition_table.probe(pos_hash)
+    if entry is not None:
+        stored_score, stored_flag = entry[1], entry[2]  # Any stored depth covers quiescence
+        if (stored_flag == EXACT or (stored_flag == LOWER and stored_score >= beta)
+                or (stored_flag == UPPER and stored_score <= alpha)):
+            return stored_score
+
+    alpha_orig = alpha
+    if in_check(pos):
+        if current_depth >= max_qs_depth:
+            return static_eval(pos)
+        best_score = -MATE_SCORE  # Stays there if there is no evasion
+        moves = [score_move(pos, move) << 16 | move for move in generate_legal_moves(pos)]
+    else:
+        stand_pat = static_eval(pos) if ply is None else search_stack[ply].static_eval  # Deep node - fast eval
+        if current_depth >= max_qs_depth or stand_pat >= beta:
+            return stand_pat
+        best_score = stand_pat
+        if alpha < stand_pat:
+            alpha = stand_pat
+        moves = []
+        for move in generate_legal_moves(pos, captures_only=True):
+            gain = see(pos, move)
+            if gain >= 0 and stand_pat + gain + DELTA_MARGIN > alpha:
+                moves.append(gain << 16 | move)
+        # First quiescence ply: quiet checks too (after the captures), so a mating or forking
+        # check just past the horizon isn't missed
+        if current_depth == 0:
+            info = check_info(pos)
+            for move in generate_legal_moves(pos, quiets_only=True):
+                if gives_check(pos, move, info) and see(pos, move) >= 0:
+                    moves.append((-1 << 16) | move)
+    moves.sort(reverse=True)
+
+    best_move = NO_MOVE
+    for key in moves:
+        move = key & 0xFFFF
+        pos.make_move(move)
+        score = -quiescence_search(pos, -beta, -alpha, current_depth + 1, max_qs_depth)
+        pos.unmake_move()
+        if stopped:
+            return 0
+        if score > best_score:
+            best_score = score
+            best_move = move
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+
+    transposition_table.store(pos_hash, 0, best_score, bound_flag(best_score, alpha_orig, beta), best_move)
+    return best_score
+#===========================================================================ENTRY POINTS===========================================================================
+def get_best_move_minimax(pos, depth=3):
+    """Best move for the side to move using a fixed-depth search (stop() cuts it short)."""
+    start_limits()
+    transposition_table.new_search()
+    heuristics.age()
+    del principal_variation[:]
+    pv_length[0] = 0
+    try:
+        move, score = search_root(pos, depth)
+        if not stopped:
+            principal_variation[:] = pv_table[0][:pv_length[0]]
+    finally:
+        clear_limits()
+    return move
+
+def get_best_move_iterative(pos, max_time=5.0, max_nodes=None, stop_event=None, time_manager=None, noise=0):
+    """
+    Search with iterative deepening.
+
+    max_time: Maximum seconds to think (None: no limit)
+    max_nodes: Maximum nodes to search (None: no limit)
+    stop_event: Event that ends the search when set, e.g. a multiprocessing.Event shared with
+                another process (stop() works too, but only from this process)
+    time_manager: engine.timeman.TimeManager for a move under a clock; its hard limit (capped
+                  by max_time) is the deadline and its soft limit decides whether to start
+                  another depth
+    noise: Give each root move a random bonus of up to this many centipawns (weaker play)
+    Returns the best move of the last completed depth; its line is left in `principal_variation`.
+    """
+    if time_manager is not None:
+        max_time = time_manager.remaining_hard() if max_time is None else min(max_time, time_manager.remaining_hard())
+    start_limits(max_time, max_nodes, stop_event)
+    root_bonus.clear()
+    if noise:
+        for move in generate_legal_moves(pos):
+            root_bonus[move] = random.randint(0, noise)
+    best_move = None
+
+    # Keep the table from earlier moves (warm start); older entries just lose replacement priority
+    transposition_table.new_search()
+    heuristics.age()
+    del principal_variation[:]
+    pv_length[0] = 0
+
+    try:
+        prev_score = 0
+        for depth in range(1, 12):  # Try increasing depths
+            if poll_stop():
+                break  # Out of time!
+
+            # Aspiration window around previous score for faster searches. A fail-low or
+            # fail-high only widens the side that failed, a little more each time
+            window = ASPIRATION_WINDOW
+            if depth == 1:
+                alpha, beta = -INFINITY, INFINITY
+            else:
+                alpha, beta = prev_score - window, prev_score + window
+            while True:
+                move, score = search_root(pos, depth, alpha, beta)
+                if stopped or move is None:
+                    break  # Stopped, or no legal moves
+                if score <= alpha:
+                    beta = (alpha + beta) // 2
+                    alpha = max(score - window, -INFINITY)
+                elif score >= beta:
+                    beta = min(score + window, INFINITY)
+                else:
+                    break
+                window *= 2
+            if stopped:
+                if best_move is None:
+                    best_move = move  # Not even depth 1 finished: a partly searched move beats none
+                break  # Keep the best move from the last completed depth
+            if move is None:
+                break
+            best_move = move
+            prev_score = score
+            principal_variation[:] = pv_table[0][:pv_length[0]]
+            print(f"Depth {depth}: score {score}, pv {' '.join(move_name(m) for m in principal_variation)}")
+            if time_manager is not None:
+                time_manager.update(move, score)
+                if time_manager.should_stop():
+                    break
+        if best_move is None:
+            best_move = next(pick_moves(pos), None)  # Stopped before any move was searched: the first in order
+    finally:
+        clear_limits()
+        root_bonus.clear()
+
+    return best_move
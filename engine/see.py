@@ -0,0 +1,60 @@
+"""Static exchange evaluation: what a capture wins once every recapture on its square is played out."""
+from engine.bitboard import PAWN, KNIGHT, KING, WHITE
+from engine.evaluate import PIECE_VALUES
+from engine.move import PROMOTION, EN_PASSANT, CASTLING, FLAG_MASK
+from engine.movegen import attackers_to
+
+# Indexed by piece code (EMPTY = 12 is worth nothing)
+SEE_VALUES = PIECE_VALUES * 2 + [0]
+
+def see(pos, move):
+    """
+    Material the side to move gains with `move` (centipawns), assuming both sides keep
+    recapturing on the target square with their least valuable attacker and may stop
+    whenever continuing would lose. Sliders hidden behind a capturer (x-rays) join in once
+    it has moved; pins are ignored.
+    """
+    flag = move & FLAG_MASK
+    if flag == CASTLING:
+        return 0
+    frm = move & 63
+    to = move >> 6 & 63
+    pieces = pos.pieces
+    mailbox = pos.mailbox
+    occupied = pos.all_occupied
+    side = pos.side
+
+    # gain[d]: material balance for the side making capture d, if the sequence stops after it
+    if flag == EN_PASSANT:
+        gain = [PIECE_VALUES[PAWN]]
+        occupied ^= 1 << (to + 8 if side == WHITE else to - 8)
+    else:
+        gain = [SEE_VALUES[mailbox[to]]]
+    on_square = SEE_VALUES[mailbox[frm]]
+    if flag == PROMOTION:
+        promoted = (move >> 12 & 3) + KNIGHT
+        gain[0] += PIECE_VALUES[promoted] - PIECE_VALUES[PAWN]
+        on_square = PIECE_VALUES[promoted]
+    capturer = 1 << frm
+
+    while True:
+        gain.append(on_square - gain[-1])
+        occupied ^= capturer
+        side ^= 1
+        attackers = attackers_to(pos, to, side, occupied) & occupied
+        if not attackers:
+            break
+        base = 6 * side
+        for piece_type in range(PAWN, KING + 1):
+            bb = attackers & pieces[base + piece_type]
+            if bb:
+                break
+        if piece_type == KING and attackers_to(pos, to, side ^ 1, occupied) & occupied:
+            break  # The king can't capture into a defended square
+        capturer = bb & -bb
+        on_square = PIECE_VALUES[piece_type]
+
+    # The last entry is a capture nobody could make; fold the rest back to the first mover
+    for d in range(len(gain) - 2, 0, -1):
+        gain[d - 1] = -max(-gain[d - 1], gain[d])
+    return gain[0]
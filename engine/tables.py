@@ -0,0 +1,109 @@
+"""Attack and ray tables, built once at import.
+
+KNIGHT_ATTACKS[sq], KING_ATTACKS[sq]  - leaper targets from each square
+PAWN_ATTACKS[color][sq]              - squares a pawn of `color` on sq attacks
+RAYS[direction][sq]                  - every square from sq (exclusive) to the board edge
+ROOK_RAYS[sq], BISHOP_RAYS[sq]       - empty-board rook / bishop attacks
+BETWEEN[a][b]                        - squares strictly between a and b (0 if not on a line)
+LINE[a][b]                           - the whole edge-to-edge line through a and b (0 if none)
+ROOK_TABLE[sq][occ & ROOK_MASKS[sq]] - rook attacks for any occupancy (same for bishops)
+"""
+from engine.bitboard import WHITE, BLACK, knight_attacks_bb, king_attacks_bb, pawn_attacks_bb
+#===========================================================================DIRECTIONS===========================================================================
+# (row step, col step); the first four are orthogonal (rook), the last four diagonal (bishop)
+NORTH, SOUTH, EAST, WEST, NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST = range(8)
+DIRECTION_STEPS = [(-1, 0), (1, 0), (0, 1), (0, -1), (-1, 1), (-1, -1), (1, 1), (1, -1)]
+ROOK_DIRECTIONS = (NORTH, SOUTH, EAST, WEST)
+BISHOP_DIRECTIONS = (NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST)
+# Directions whose square index grows along the ray: the nearest blocker is the lowest set bit
+INCREASING = (False, True, True, False, False, False, True, True)
+#===========================================================================LEAPERS===========================================================================
+KNIGHT_ATTACKS = [knight_attacks_bb(1 << sq) for sq in range(64)]
+KING_ATTACKS = [king_attacks_bb(1 << sq) for sq in range(64)]
+PAWN_ATTACKS = [[pawn_attacks_bb(color, 1 << sq) for sq in range(64)] for color in (WHITE, BLACK)]
+#===========================================================================RAYS===========================================================================
+def _walk(sq, d_row, d_col):
+    """Squares from sq (exclusive) to the edge, in order."""
+    row, col = sq >> 3, sq & 7
+    squares = []
+    row += d_row
+    col += d_col
+    while 0 <= row < 8 and 0 <= col < 8:
+        squares.append(row * 8 + col)
+        row += d_row
+        col += d_col
+    return squares
+
+def _bits(squares):
+    bb = 0
+    for sq in squares:
+        bb |= 1 << sq
+    return bb
+
+RAYS = [[_bits(_walk(sq, d_row, d_col)) for sq in range(64)] for d_row, d_col in DIRECTION_STEPS]
+# Empty-board slider attacks, for cheap "could this piece possibly attack sq" tests
+ROOK_RAYS = [RAYS[NORTH][sq] | RAYS[SOUTH][sq] | RAYS[EAST][sq] | RAYS[WEST][sq] for sq in range(64)]
+BISHOP_RAYS = [RAYS[NORTH_EAST][sq] | RAYS[NORTH_WEST][sq] | RAYS[SOUTH_EAST][sq] | RAYS[SOUTH_WEST][sq]
+               for sq in range(64)]
+
+BETWEEN = [[0] * 64 for _ in range(64)]
+LINE = [[0] * 64 for _ in range(64)]
+for _sq in range(64):
+    for _d, (_d_row, _d_col) in enumerate(DIRECTION_STEPS):
+        _ray = _walk(_sq, _d_row, _d_col)
+        _full_line = _bits(_walk(_sq, -_d_row, -_d_col)) | _bits(_ray) | (1 << _sq)
+        for _i, _target in enumerate(_ray):
+            BETWEEN[_sq][_target] = _bits(_ray[:_i])
+            LINE[_sq][_target] = _full_line
+del _sq, _d, _d_row, _d_col, _ray, _full_line, _i, _target
+#===========================================================================SLIDING ATTACKS===========================================================================
+def ray_attacks(sq, occupied, direction):
+    """Attacks along one ray: stop at (and include) the first occupied square."""
+    ray = RAYS[direction][sq]
+    blockers = ray & occupied
+    if not blockers:
+        return ray
+    if INCREASING[direction]:
+        first = (blockers & -blockers).bit_length() - 1
+    else:
+        first = blockers.bit_length() - 1
+    return ray ^ RAYS[direction][first]
+
+def _relevant_mask(sq, directions):
+    """Squares whose occupancy can change a slider's attacks: its rays minus the edge square of each."""
+    mask = 0
+    for direction in directions:
+        ray = RAYS[direction][sq]
+        if ray:
+            edge = (1 << (ray.bit_length() - 1)) if INCREASING[direction] else (ray & -ray)
+            mask |= ray ^ edge
+    return mask
+
+def _attack_table(sq, mask, directions):
+    """Map every subset of `mask` (carry-rippler enumeration) to the slider's attack set."""
+    table = {}
+    subset = 0
+    while True:
+        attacks = 0
+        for direction in directions:
+            attacks |= ray_attacks(sq, subset, direction)
+        table[subset] = attacks
+        subset = (subset - mask) & mask
+        if not subset:
+            return table
+
+# PEXT-style lookup: attacks = TABLE[sq][occupied & MASK[sq]], one dict lookup per slider
+# (magic bitboards without the multiply - the dict hashes the masked occupancy for us)
+ROOK_MASKS = [_relevant_mask(sq, ROOK_DIRECTIONS) for sq in range(64)]
+BISHOP_MASKS = [_relevant_mask(sq, BISHOP_DIRECTIONS) for sq in range(64)]
+ROOK_TABLE = [_attack_table(sq, ROOK_MASKS[sq], ROOK_DIRECTIONS) for sq in range(64)]
+BISHOP_TABLE = [_attack_table(sq, BISHOP_MASKS[sq], BISHOP_DIRECTIONS) for sq in range(64)]
+
+def rook_attacks(sq, occupied):
+    return ROOK_TABLE[sq][occupied & ROOK_MASKS[sq]]
+
+def bishop_attacks(sq, occupied):
+    return BISHOP_TABLE[sq][occupied & BISHOP_MASKS[sq]]
+
+def queen_attacks(sq, occupied):
+    return ROOK_TABLE[sq][occupied & ROOK_MASKS[sq]] | BISHOP_TABLE[sq][occupied & BISHOP_MASKS[sq]]
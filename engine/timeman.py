@@ -0,0 +1,58 @@
+"""Time management: how long the engine may think about one move under a chess clock.
+
+The hard limit is where the search is stopped no matter what. The soft limit is checked
+between iterative-deepening iterations: past it, no new depth is started. It shrinks while
+the best move stays the same and grows when the score drops, since that is when the extra
+depth is most likely to change the move.
+"""
+import time
+
+MOVES_TO_GO = 30       # Moves the remaining time is spread over (sudden death clocks)
+MOVE_OVERHEAD = 0.05   # Seconds kept back per move for drawing, animation and clock lag
+HARD_SHARE = 0.25      # Never spend more than this share of the remaining time on one move
+HARD_FACTOR = 4.0      # ... or more than this many soft limits
+MIN_TIME = 0.02
+STABLE_ITERATIONS = 2  # Same best move this many iterations in a row: shorten the soft limit
+STABLE_SCALE = 0.6
+SCORE_DROP = 30        # Score fell this much (centipawns) since the last iteration: lengthen it
+DROP_SCALE = 2.0
+
+def allocate(remaining, increment=0.0, moves_to_go=None):
+    """(soft, hard) seconds for the next move from the time left on the clock."""
+    available = max(remaining - MOVE_OVERHEAD, 0.0)
+    soft = available / (moves_to_go or MOVES_TO_GO) + 0.75 * increment
+    hard = min(available * HARD_SHARE + increment, soft * HARD_FACTOR)
+    hard = max(min(hard, available), MIN_TIME)
+    return max(min(soft, hard), MIN_TIME), hard
+
+class TimeManager:
+    """Limits for one move, adjusted after each completed iteration by update()."""
+    __slots__ = ('start', 'soft', 'hard', 'scale', 'stable', 'last_move', 'last_score')
+
+    def __init__(self, remaining, increment=0.0, moves_to_go=None):
+        self.start = time.time()
+        self.soft, self.hard = allocate(remaining, increment, moves_to_go)
+        self.scale = 1.0
+        self.stable = 0
+        self.last_move = None
+        self.last_score = None
+
+    def update(self, move, score):
+        """Record the result of a completed iteration."""
+        self.stable = self.stable + 1 if move == self.last_move else 0
+        self.scale = STABLE_SCALE if self.stable >= STABLE_ITERATIONS else 1.0
+        if self.last_score is not None and score <= self.last_score - SCORE_DROP:
+            self.scale = DROP_SCALE
+        self.last_move = move
+        self.last_score = score
+
+    def elapsed(self):
+        return time.time() - self.start
+
+    def should_stop(self):
+        """True once another iteration isn't worth starting."""
+        return self.elapsed() >= min(self.soft * self.scale, self.hard)
+
+    def remaining_hard(self):
+        """Seconds left before the hard limit (the stop token's deadline)."""
+        return max(self.hard - self.elapsed(), 0.0)
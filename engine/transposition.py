@@ -0,0 +1,85 @@
+"""Fixed-size transposition table.
+
+Slots live in two preallocated lists (`keys`, `entries`). Each position hash maps to a bucket
+of two slots: slot 2b keeps the deepest result (depth-preferred), slot 2b + 1 takes whatever
+did not earn the first slot (always-replace). Entries remember the search generation that
+stored them, so results left over from earlier moves give way to fresh ones while still being
+probed until they are overwritten - the table survives between moves instead of being cleared.
+Each entry also keeps the best move found, which the search tries first (the hash move).
+"""
+from engine.move import NO_MOVE
+#===========================================================================FLAGS===========================================================================
+EXACT = 0
+LOWER = 1   # Fail high: score is a lower bound
+UPPER = 2   # Fail low: score is an upper bound
+
+DEFAULT_SIZE_MB = 16
+# Rough memory cost of one filled slot in CPython (hash int + entry tuple + two list pointers)
+ENTRY_BYTES = 128
+# A result for a position already in the depth-preferred slot replaces it only if it is at most
+# this much shallower, whatever its flag (so quiescence stores can't wipe out a deep search)
+REPLACE_DEPTH_MARGIN = 2
+#===========================================================================TABLE===========================================================================
+class TranspositionTable:
+    """entries[i] is (depth, score, flag, move, generation) for the position whose hash is keys[i]."""
+    __slots__ = ('keys', 'entries', 'mask', 'generation')
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB):
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        """Reallocate for about `size_mb` megabytes (bucket count rounded down to a power of two)."""
+        buckets = 1
+        while buckets * 4 * ENTRY_BYTES <= size_mb * 1024 * 1024:
+            buckets *= 2
+        self.mask = buckets - 1
+        self.keys = [0] * (2 * buckets)
+        self.entries = [None] * (2 * buckets)
+        self.generation = 0
+
+    def clear(self):
+        """Drop every entry (new game)."""
+        size = len(self.keys)
+        self.keys = [0] * size
+        self.entries = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        """Start a new search: entries from earlier generations become replaceable."""
+        self.generation += 1
+
+    def probe(self, key):
+        """The stored (depth, score, flag, move, generation) for `key`, or None."""
+        i = (key & self.mask) << 1
+        keys = self.keys
+        if keys[i] == key:
+            return self.entries[i]
+        if keys[i + 1] == key:
+            return self.entries[i + 1]
+        return None
+
+    def store(self, key, depth, score, flag, move=NO_MOVE):
+        """Save a search result; without a new best move, one already stored for `key` is kept."""
+        if not move:
+            old = self.probe(key)
+            if old is not None:
+                move = old[3]
+        i = (key & self.mask) << 1
+        keys = self.keys
+        entries = self.entries
+        entry = (depth, score, flag, move, self.generation)
+        deepest = entries[i]
+        if keys[i] == key and deepest is not None:
+            if depth < deepest[0] - REPLACE_DEPTH_MARGIN:
+                return  # Keep the deeper result
+            entries[i] = entry
+        elif deepest is None or deepest[4] != self.generation or depth >= deepest[0]:
+            keys[i] = key
+            entries[i] = entry
+            if keys[i + 1] == key:
+                keys[i + 1] = 0  # Don't keep a second, older copy of the same position
+                entries[i + 1] = None
+        else:
+            keys[i + 1] = key
+            entries[i + 1] = entry
+
@@ -0,0 +1,98 @@
+"""Move generator regression tests: perft counts against published reference values, make/unmake,
+and the per-move helpers (gives_check, is_legal_move) against slow equivalents.
+
+Run from the repository root: python -m unittest discover tests  (or: python -m pytest tests)
+"""
+import unittest
+
+from engine.position import Position
+from engine.movegen import perft, generate_legal_moves, gives_check, check_info, in_check, is_legal_move
+
+# (FEN, leaf counts at depth 1, 2, ...) from the chessprogramming.org perft results
+PERFT_CASES = [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", [20, 400, 8902, 197281]),
+    # "Kiwipete": castling, en passant, pins and promotions-to-be
+    ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862]),
+    # Position 3: en passant discovered checks along the rank
+    ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238]),
+    # Position 4: promotions and castling out of / through check
+    ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467]),
+    # Position 5
+    ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379]),
+]
+
+# Positions where the checking move is one gives_check has to reason about specially
+GIVES_CHECK_CASES = [
+    "5k2/8/8/8/8/8/8/4K2R w K - 0 1",      # Castling: the rook gives the check
+    "8/8/8/k2pP2R/8/8/8/4K3 w - d6 0 1",    # En passant uncovers the rook along the rank
+    "2k5/4P3/8/8/8/8/8/4K3 w - - 0 1",      # Promotions: queen and rook check, knight and bishop don't
+    "4k3/8/8/8/4N3/8/8/4R1K1 w - - 0 1",    # Knight moves discover the rook
+]
+
+def snapshot(pos):
+    return (pos.pieces[:], pos.occupied[:], pos.mailbox[:], pos.side, pos.castling,
+            pos.ep_square, pos.halfmove_clock, pos.hash, pos.king_sq[:])
+
+class PerftTest(unittest.TestCase):
+    def test_reference_counts(self):
+        for fen, counts in PERFT_CASES:
+            pos = Position.from_fen(fen)
+            before = snapshot(pos)
+            for depth, expected in enumerate(counts, 1):
+                with self.subTest(fen=fen, depth=depth):
+                    self.assertEqual(perft(pos, depth), expected)
+            self.assertEqual(snapshot(pos), before)  # make/unmake left the position untouched
+
+class MakeUnmakeTest(unittest.TestCase):
+    def walk(self, pos, depth):
+        for move in generate_legal_moves(pos):
+            before = snapshot(pos)
+            pos.make_move(move)
+            self.assertEqual(pos.hash, pos.compute_hash())  # Incremental key matches a full recompute
+            if depth > 1:
+                self.walk(pos, depth - 1)
+            pos.unmake_move()
+            self.assertEqual(snapshot(pos), before)
+
+    def test_hash_and_restore(self):
+        for fen, _ in PERFT_CASES:
+            with self.subTest(fen=fen):
+                self.walk(Position.from_fen(fen), 2)
+
+class IsLegalMoveTest(unittest.TestCase):
+    """is_legal_move vets hash moves and killers, which come from other nodes of the tree."""
+    def test_agrees_with_generator(self):
+        for fen, _ in PERFT_CASES:
+            pos = Position.from_fen(fen)
+            candidates = set()  # Moves of the root and of every reply: mostly illegal elsewhere
+            for move in generate_legal_moves(pos):
+                candidates.add(move)
+                pos.make_move(move)
+                candidates.update(generate_legal_moves(pos))
+                pos.unmake_move()
+            for move in generate_legal_moves(pos):
+                pos.make_move(move)
+                legal = set(generate_legal_moves(pos))
+                wrong = [c for c in candidates if is_legal_move(pos, c) != (c in legal)]
+                pos.unmake_move()
+                with self.subTest(fen=fen, move=move):
+                    self.assertEqual(wrong, [])
+
+class GivesCheckTest(unittest.TestCase):
+    def walk(self, pos, depth):
+        info = check_info(pos)
+        for move in generate_legal_moves(pos):
+            checks = gives_check(pos, move, info)
+            pos.make_move(move)
+            self.assertEqual(checks, in_check(pos))
+            if depth > 1:
+                self.walk(pos, depth - 1)
+            pos.unmake_move()
+
+    def test_gives_check(self):
+        for fen in [fen for fen, _ in PERFT_CASES] + GIVES_CHECK_CASES:
+            with self.subTest(fen=fen):
+                self.walk(Position.from_fen(fen), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Search tests: stopping (stop(), time and node limits) and its effect on the position, and
+draws by repetition and the fifty-move rule inside the tree.
+
+Run from the repository root: python -m unittest discover tests  (or: python -m pytest tests)
+"""
+import threading
+import time
+import unittest
+
+from engine import search
+from engine.position import Position
+from engine.movegen import generate_legal_moves
+from engine.move import move_name
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+def play(pos, *names):
+    for name in names:
+        pos.make_move(next(move for move in generate_legal_moves(pos) if move_name(move) == name))
+
+def snapshot(pos):
+    return (pos.pieces[:], pos.occupied[:], pos.mailbox[:], pos.side, pos.castling,
+            pos.ep_square, pos.halfmove_clock, pos.hash, pos.king_sq[:], len(pos.undo_stack))
+
+class StopTest(unittest.TestCase):
+    def setUp(self):
+        search.reset_tables()
+        self.pos = Position.from_fen(KIWIPETE)
+
+    def test_stale_stop_is_ignored(self):
+        search.stop()  # No search running: must not reach the next one
+        move = search.get_best_move_iterative(self.pos, max_time=None, max_nodes=3000)
+        self.assertGreaterEqual(search.nodes, 3000)
+        self.assertIn(move, generate_legal_moves(self.pos))
+
+    def test_stop_for_pending_search(self):
+        search.stop(search.next_search_id())
+        move = search.get_best_move_iterative(self.pos, max_time=None, max_nodes=3000)
+        self.assertEqual(search.nodes, 0)
+        self.assertIn(move, generate_legal_moves(self.pos))
+        search.get_best_move_iterative(self.pos, max_time=None, max_nodes=3000)
+        self.assertGreaterEqual(search.nodes, 3000)  # Only that search was stopped
+
+    def test_stop_from_another_thread(self):
+        timer = threading.Timer(0.2, search.stop)
+        timer.start()
+        start = time.time()
+        move = search.get_best_move_iterative(self.pos, max_time=None)
+        timer.join()
+        self.assertLess(time.time() - start, 5)
+        self.assertIn(move, generate_legal_moves(self.pos))
+
+    def test_timed_out_search_leaves_position_untouched(self):
+        before = snapshot(self.pos)
+        for limits in ({'max_time': 0.3}, {'max_time': None, 'max_nodes': 1000}):
+            with self.subTest(**limits):
+                move = search.get_best_move_iterative(self.pos, **limits)
+                self.assertEqual(snapshot(self.pos), before)
+                self.assertIn(move, generate_legal_moves(self.pos))
+
+class DrawDetectionTest(unittest.TestCase):
+    def setUp(self):
+        search.reset_tables()
+        search.start_limits()  # negamax is called directly, as inside a search
+
+    def tearDown(self):
+        search.clear_limits()
+
+    def test_is_repetition(self):
+        pos = Position.from_fen(START)
+        play(pos, "g1f3", "g8f6")
+        self.assertFalse(pos.is_repetition())
+        play(pos, "f3g1", "f6g8")
+        self.assertTrue(pos.is_repetition())  # Back to the start position
+        pos.make_null_move()
+        pos.make_null_move()
+        self.assertFalse(pos.is_repetition())  # The scan stops at a null move
+
+    def test_repetition_in_tree_is_a_draw(self):
+        pos = Position.from_fen("4k3/8/8/8/8/8/8/QQ2K3 w - - 0 1")  # White is far ahead...
+        play(pos, "e1d2", "e8d7", "d2e1", "d7e8")  # ...but this position has been seen before
+        self.assertEqual(search.negamax(pos, 2, ply=1), search.DRAW_SCORE)
+        self.assertGreater(search.negamax(pos, 2, ply=0), 1000)  # The root itself is searched
+
+    def test_fifty_move_rule_in_tree_is_a_draw(self):
+        pos = Position.from_fen("4k3/8/8/8/8/8/8/QQ2K3 w - - 100 80")
+        self.assertEqual(search.negamax(pos, 2, ply=1), search.DRAW_SCORE)
+
+if __name__ == '__main__':
+    unittest.main()
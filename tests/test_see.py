@@ -0,0 +1,35 @@
+"""Static exchange evaluation tests on small hand-checked exchanges.
+
+Run from the repository root: python -m unittest discover tests  (or: python -m pytest tests)
+"""
+import unittest
+
+from engine.position import Position
+from engine.movegen import generate_legal_moves
+from engine.move import move_name
+from engine.see import see
+
+# (FEN, move, expected gain in centipawns for the side making it)
+SEE_CASES = [
+    ("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5", 100),           # Undefended pawn
+    ("4k3/8/2p5/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5", 0),           # Pawn for pawn
+    ("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1", "d1d5", -800),         # Queen for a defended pawn
+    ("3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1", "d2d5", 100),         # The rook behind (x-ray) recaptures
+    ("3rk3/8/8/3p4/8/8/3R4/4K3 w - - 0 1", "d2d5", -400),         # Without it the rook is lost
+    ("4k3/3r4/8/1B6/8/8/8/3QK3 w - - 0 1", "d1d7", 500),          # King can't retake a defended square
+    ("4k3/3r4/8/8/8/8/8/3QK3 w - - 0 1", "d1d7", -400),           # ...but retakes an undefended one
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", 100),           # En passant
+    ("4k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a7a8q", 800),             # Promotion push
+    ("4k3/8/8/8/8/8/8/4K2R w K - 0 1", "e1g1", 0),                # Castling
+]
+
+class SeeTest(unittest.TestCase):
+    def test_exchanges(self):
+        for fen, name, expected in SEE_CASES:
+            with self.subTest(fen=fen, move=name):
+                pos = Position.from_fen(fen)
+                moves = {move_name(move): move for move in generate_legal_moves(pos)}
+                self.assertEqual(see(pos, moves[name]), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Time manager tests: budgets from the clock, soft-limit adjustments and the hard limit in a search.
+
+Run from the repository root: python -m unittest discover tests  (or: python -m pytest tests)
+"""
+import time
+import unittest
+
+from engine import search
+from engine.position import Position
+from engine.timeman import (allocate, TimeManager, MOVE_OVERHEAD, MIN_TIME, HARD_SHARE,
+                            STABLE_ITERATIONS, STABLE_SCALE, SCORE_DROP, DROP_SCALE)
+
+class AllocateTest(unittest.TestCase):
+    def test_budgets(self):
+        for remaining, increment, moves_to_go in [(300, 0, None), (60, 2, None), (10, 0, 5), (1, 0, 1)]:
+            with self.subTest(remaining=remaining, increment=increment, moves_to_go=moves_to_go):
+                soft, hard = allocate(remaining, increment, moves_to_go)
+                self.assertLessEqual(MIN_TIME, soft)
+                self.assertLessEqual(soft, hard)
+                self.assertLessEqual(hard, (remaining - MOVE_OVERHEAD) * HARD_SHARE + increment)
+
+    def test_increment_adds_time(self):
+        self.assertGreater(allocate(60, 2)[0], allocate(60)[0])
+
+    def test_flag_about_to_fall(self):
+        self.assertEqual(allocate(0.01), (MIN_TIME, MIN_TIME))
+
+class TimeManagerTest(unittest.TestCase):
+    def test_stable_move_shortens_soft_limit(self):
+        manager = TimeManager(60)
+        for _ in range(STABLE_ITERATIONS + 1):
+            manager.update(1, 20)
+        self.assertEqual(manager.scale, STABLE_SCALE)
+        manager.update(2, 20)  # A new best move resets it
+        self.assertEqual(manager.scale, 1.0)
+
+    def test_score_drop_lengthens_soft_limit(self):
+        manager = TimeManager(60)
+        manager.update(1, 20)
+        manager.update(1, 20 - SCORE_DROP)
+        self.assertEqual(manager.scale, DROP_SCALE)
+
+    def test_should_stop(self):
+        manager = TimeManager(60)
+        self.assertFalse(manager.should_stop())
+        manager.start -= manager.soft  # As if a soft limit's worth of time had passed
+        self.assertTrue(manager.should_stop())
+        manager.start -= manager.hard
+        self.assertEqual(manager.remaining_hard(), 0.0)
+
+    def test_search_keeps_to_hard_limit(self):
+        search.reset_tables()
+        pos = Position.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        manager = TimeManager(2.0)
+        start = time.time()
+        move = search.get_best_move_iterative(pos, max_time=None, time_manager=manager)
+        self.assertIsNotNone(move)
+        self.assertLess(time.time() - start, manager.hard + 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
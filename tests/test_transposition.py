@@ -0,0 +1,54 @@
+"""Transposition table replacement policy tests.
+
+Run from the repository root: python -m unittest discover tests  (or: python -m pytest tests)
+"""
+import unittest
+
+from engine.transposition import TranspositionTable, EXACT, LOWER, UPPER, REPLACE_DEPTH_MARGIN
+
+MOVE = 12 | 28 << 6  # e7e5
+OTHER_MOVE = 11 | 27 << 6  # d7d5
+
+class ReplacementTest(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(1)
+        self.key = 0x1234567 << 20
+        self.collision = self.key + self.table.mask + 1  # Same bucket, different position
+
+    def test_shallow_result_keeps_deep_entry(self):
+        table = self.table
+        table.store(self.key, 9, 40, LOWER, MOVE)
+        for flag in (EXACT, LOWER, UPPER):
+            with self.subTest(flag=flag):
+                table.store(self.key, 0, -300, flag)
+                self.assertEqual(table.probe(self.key), (9, 40, LOWER, MOVE, 0))
+
+    def test_result_within_margin_replaces(self):
+        table = self.table
+        table.store(self.key, 9, 40, LOWER, MOVE)
+        table.store(self.key, 9 - REPLACE_DEPTH_MARGIN, 25, UPPER)
+        self.assertEqual(table.probe(self.key), (9 - REPLACE_DEPTH_MARGIN, 25, UPPER, MOVE, 0))  # Move kept
+        table.store(self.key, 12, 30, EXACT, OTHER_MOVE)
+        self.assertEqual(table.probe(self.key), (12, 30, EXACT, OTHER_MOVE, 0))
+
+    def test_collision_goes_to_always_replace_slot(self):
+        table = self.table
+        table.store(self.key, 9, 40, EXACT, MOVE)
+        table.store(self.collision, 3, 10, EXACT, OTHER_MOVE)
+        self.assertEqual(table.probe(self.key)[0], 9)
+        self.assertEqual(table.probe(self.collision)[0], 3)
+        table.store(self.collision, 10, 15, EXACT, OTHER_MOVE)  # Deeper: takes the first slot
+        self.assertIsNone(table.probe(self.key))
+        self.assertEqual(table.probe(self.collision), (10, 15, EXACT, OTHER_MOVE, 0))
+        self.assertNotIn(self.collision, table.keys[1::2])  # No second, older copy left behind
+
+    def test_old_generation_gives_way(self):
+        table = self.table
+        table.store(self.key, 9, 40, EXACT, MOVE)
+        table.new_search()
+        table.store(self.collision, 1, 10, UPPER)
+        self.assertEqual(table.probe(self.collision), (1, 10, UPPER, 0, 1))
+        self.assertIsNone(table.probe(self.key))
+
+if __name__ == '__main__':
+    unittest.main()